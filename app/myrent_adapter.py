@@ -133,10 +133,32 @@ def _parse_dt_any(value: Any) -> Optional[datetime]:
 
 
 
+# Regex compilate una volta a livello di modulo (codici prenotazione "SUL 6268 TESTDOGMA").
+_WS_RUN_RE = re.compile(r"\s+")
+_BOOKING_ID_RE = re.compile(r"^(?P<prefix>[A-Za-z]+)\s+(?P<number>\d+)(?:\s+(?P<voucher>.+))?$")
+_RESERVATION_CODE_RE = re.compile(r"^(?P<prefix>[A-Za-z]+)\s+(?P<number>\d+)(?:\s+(?P<confirmation>.+))?$")
+
+
+def _is_iso_minutes(s: str) -> bool:
+    # YYYY-MM-DDTHH:MM verificato per posizione dei separatori e cifre, senza parsing
+    return (
+        s[4] == "-" and s[7] == "-" and s[10] == "T" and s[13] == ":"
+        and s[:4].isdigit() and s[5:7].isdigit() and s[8:10].isdigit()
+        and s[11:13].isdigit() and s[14:16].isdigit()
+    )
+
+
 def _fmt_dt_no_tz_seconds(value: Union[str, datetime]) -> str:
     if isinstance(value, datetime):
-        return value.replace(microsecond=0).strftime("%Y-%m-%dT%H:%M:%S")
+        return f"{value.year:04d}-{value.month:02d}-{value.day:02d}T{value.hour:02d}:{value.minute:02d}:{value.second:02d}"
     if isinstance(value, str):
+        # caso comune: stringa già nel formato finale (o senza secondi), nessun parsing datetime
+        s = value.strip()
+        n = len(s)
+        if n == 19 and s[16] == ":" and s[17:19].isdigit() and _is_iso_minutes(s):
+            return s
+        if n == 16 and _is_iso_minutes(s):
+            return s + ":00"
         dt = _parse_dt_any(value)
         if dt is None:
             return value.strip()
@@ -487,7 +509,7 @@ class MyRentAdapter:
         reservation_voucher: Optional[str] = None
 
         # esempio atteso: "SUL 6268 TESTDOGMA"
-        m = re.match(r"^(?P<prefix>[A-Za-z]+)\s+(?P<number>\d+)(?:\s+(?P<voucher>.+))?$", booking_str)
+        m = _BOOKING_ID_RE.match(booking_str)
         if m:
             reservation_prefix = m.group("prefix").strip()
             reservation_number = m.group("number").strip()
@@ -1103,14 +1125,11 @@ class MyRentAdapter:
         )
 
     def _parse_external_reservation_code(self, reservation_code: str) -> Dict[str, Optional[str]]:
-        raw = re.sub(r"\s+", " ", (reservation_code or "").strip())
+        raw = _WS_RUN_RE.sub(" ", (reservation_code or "").strip())
         if not raw:
             raise MyRentAdapterError("reservation_code vuoto")
 
-        m = re.match(
-            r"^(?P<prefix>[A-Za-z]+)\s+(?P<number>\d+)(?:\s+(?P<confirmation>.+))?$",
-            raw
-        )
+        m = _RESERVATION_CODE_RE.match(raw)
         if not m:
             raise MyRentAdapterError(
                 f"Formato reservation_code non valido: '{reservation_code}'. "
@@ -1420,7 +1439,7 @@ class MyRentAdapter:
         if value is None:
             return None
 
-        s = re.sub(r"\s+", " ", str(value).strip())
+        s = _WS_RUN_RE.sub(" ", str(value).strip())
         if not s:
             return None
 
@@ -5,10 +5,27 @@ from __future__ import annotations
 
 import json
 import sys
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Backend JSON: orjson se disponibile, altrimenti ujson, infine la stdlib.
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import ujson
+except ImportError:  # pragma: no cover
+    ujson = None  # type: ignore[assignment]
 
 
 # =====================================================================================
@@ -134,42 +151,164 @@ MACRO_DESC: Optional[str] = None
 # HELPERS HTTP / OUTPUT
 # =====================================================================================
 
+_API_BASE = (
+    f"{BASE_URL.rstrip('/')}/{ROOT_PATH.strip('/')}" if ROOT_PATH.strip("/") else BASE_URL.rstrip("/")
+)
+
+
+@lru_cache(maxsize=256)
 def api_url(path: str) -> str:
-    base = BASE_URL.rstrip("/")
-    root = ROOT_PATH.strip("/")
-    p = path.lstrip("/")
-    return f"{base}/{root}/{p}" if root else f"{base}/{p}"
+    return f"{_API_BASE}/{path.lstrip('/')}"
 
 
-def headers() -> Dict[str, str]:
-    return {
-        "X-API-Key": API_KEY,
-        "Content-Type": "application/json",
-        "Accept": "application/json",
-    }
+_HEADERS = MappingProxyType({
+    "X-API-Key": API_KEY,
+    "Content-Type": "application/json",
+    "Accept": "application/json",
+})
+
+
+if orjson is not None:
+    _ORJSON_OPTS = orjson.OPT_NON_STR_KEYS
+
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, default=str, option=_ORJSON_OPTS)
+
+    def _dumps_pretty(obj: Any) -> bytes:
+        return orjson.dumps(obj, default=str, option=_ORJSON_OPTS | orjson.OPT_INDENT_2)
+
+    _loads = orjson.loads
+
+elif ujson is not None:  # pragma: no cover
+    # ujson non ha default=str su tutte le versioni: per datetime/Decimal & co. si ricade
+    # sulla stdlib, che li converte in stringa come prima.
+    def _dumps(obj: Any) -> bytes:
+        try:
+            return ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False).encode("utf-8")
+        except TypeError:
+            return json.dumps(obj, ensure_ascii=False, default=str).encode("utf-8")
+
+    def _dumps_pretty(obj: Any) -> bytes:
+        try:
+            return ujson.dumps(obj, indent=2, ensure_ascii=False, escape_forward_slashes=False).encode("utf-8")
+        except TypeError:
+            return json.dumps(obj, indent=2, ensure_ascii=False, default=str).encode("utf-8")
+
+    _loads = ujson.loads
+
+else:  # pragma: no cover
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, default=str).encode("utf-8")
+
+    def _dumps_pretty(obj: Any) -> bytes:
+        return json.dumps(obj, indent=2, ensure_ascii=False, default=str).encode("utf-8")
+
+    _loads = json.loads
 
 
 def safe_json(resp: requests.Response) -> Any:
     try:
-        return resp.json()
+        # Le richieste partono con stream=True: resp.content drena il body
+        # una sola volta in bytes (e lo tiene per l'eventuale fallback su
+        # resp.text), che vengono parsati senza decode intermedio in str.
+        return _loads(resp.content)
     except Exception:
         return {"raw": resp.text}
 
 
+def json_body(payload: Any) -> bytes:
+    return _dumps(payload)
+
+
 def jprint(obj: Any) -> None:
-    print(json.dumps(obj, indent=2, ensure_ascii=False, default=str))
+    # Scriviamo i bytes UTF-8 direttamente sul buffer di stdout. Le liste
+    # vengono emesse un elemento alla volta, così il picco di memoria resta
+    # quello del singolo item. Se stdout non ha un buffer binario (StringIO,
+    # output catturato) si decodifica e si scrive come testo.
+    sys.stdout.flush()
+    out = getattr(sys.stdout, "buffer", None)
+    if out is not None:
+        write = out.write
+    else:
+        out = sys.stdout
+
+        def write(data: bytes) -> None:
+            out.write(data.decode("utf-8"))
+
+    if isinstance(obj, list) and obj:
+        write(b"[\n")
+        last = len(obj) - 1
+        for i, item in enumerate(obj):
+            write(_dumps_pretty(item))
+            write(b",\n" if i < last else b"\n")
+        write(b"]\n")
+    else:
+        write(_dumps_pretty(obj))
+        write(b"\n")
+    out.flush()
+
+
+_HRULE_TOP = "\n" + "=" * 110
+_HRULE_SUB = "-" * 110
 
 
 def hrule(title: Optional[str] = None) -> None:
-    print("\n" + "=" * 110)
+    print(_HRULE_TOP)
     if title:
         print(title)
-        print("-" * 110)
+        print(_HRULE_SUB)
 
 
-def request_get(path: str, *, params: Optional[Dict[str, Any]] = None) -> Any:
-    url = api_url(path)
-    resp = requests.get(url, headers=headers(), params=params, timeout=TIMEOUT)
+# Con stdout rediretto (file, log, CI) la formattazione a colonne è solo costo:
+# in quel caso ogni riga viene emessa come JSON compatto (NDJSON).
+STDOUT_IS_TTY = sys.stdout.isatty()
+
+
+def print_rows(rows: List[Any], fmt_row: Callable[[int, Any], str]) -> None:
+    # rows: dict oppure oggetti riga con to_dict() (es. OfferRow).
+    if not STDOUT_IS_TTY:
+        sys.stdout.write(
+            "".join(_dumps(r if type(r) is dict else r.to_dict()).decode("utf-8") + "\n" for r in rows)
+        )
+        return
+    if rows:
+        sys.stdout.write("\n".join([fmt_row(i, row) for i, row in enumerate(rows, start=1)]) + "\n")
+
+
+# Sessione condivisa: tutte le chiamate vanno sullo stesso host della wrapper,
+# riusiamo la connessione (keep-alive) invece di riaprirla a ogni richiesta.
+# Pool e retry sono gestiti dall'adapter (solo metodi idempotenti: il POST di
+# compose non viene mai ripetuto); gli header fissi stanno sulla sessione.
+POOL_MAXSIZE = 32
+
+SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=POOL_MAXSIZE,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=(429, 500, 502, 503, 504),
+        raise_on_status=False,
+    ),
+)
+SESSION.mount("https://", _ADAPTER)
+SESSION.mount("http://", _ADAPTER)
+SESSION.headers.update(_HEADERS)
+
+
+def send_get(path: str, *, params: Optional[Dict[str, Any]] = None) -> requests.Response:
+    return SESSION.get(api_url(path), params=params, timeout=TIMEOUT, stream=True)
+
+
+def request_get(
+    path: str,
+    *,
+    params: Optional[Dict[str, Any]] = None,
+    pending: Optional["Future[requests.Response]"] = None,
+) -> Any:
+    # pending: GET già avviato in background (prefetch); qui ne consumiamo solo l'esito.
+    resp = pending.result() if pending is not None else send_get(path, params=params)
     print(f"GET  {resp.url} -> {resp.status_code}")
     data = safe_json(resp)
     if resp.status_code >= 400:
@@ -181,12 +320,12 @@ def request_get(path: str, *, params: Optional[Dict[str, Any]] = None) -> Any:
 
 def request_post(path: str, payload: Dict[str, Any], *, params: Optional[Dict[str, Any]] = None) -> Any:
     url = api_url(path)
-    resp = requests.post(
+    resp = SESSION.post(
         url,
-        headers=headers(),
         params=params,
-        data=json.dumps(payload, ensure_ascii=False),
+        data=json_body(payload),
         timeout=TIMEOUT,
+        stream=True,
     )
     print(f"POST {resp.url} -> {resp.status_code}")
     data = safe_json(resp)
@@ -205,16 +344,20 @@ def first_non_empty(*values: Any) -> Optional[Any]:
     for v in values:
         if v is None:
             continue
-        if isinstance(v, str):
-            if v.strip():
-                return v.strip()
+        if type(v) is str:
+            v = v.strip()
+            if v:
+                return v
             continue
         return v
     return None
 
 
 def normalize_spaces(value: str) -> str:
-    return " ".join(str(value or "").strip().split())
+    # split() senza argomenti scarta già gli spazi iniziali/finali.
+    if type(value) is not str:
+        value = str(value or "")
+    return " ".join(value.split())
 
 
 def dict_get(d: Optional[Dict[str, Any]], *keys: str) -> Any:
@@ -242,7 +385,7 @@ def nested_get(data: Any, *path: str) -> Any:
 # =====================================================================================
 
 def iso_no_tz_seconds(dt: datetime) -> str:
-    return dt.replace(microsecond=0).strftime("%Y-%m-%dT%H:%M:%S")
+    return f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d}T{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}"
 
 
 def parse_iso_any(s: str) -> Optional[datetime]:
@@ -327,24 +470,39 @@ def get_vehicle_total_charge(vs: Dict[str, Any]) -> Dict[str, Any]:
     return tc if isinstance(tc, dict) else {}
 
 
+_EMPTY_VEHICLE: Dict[str, Any] = {}
+
+
+def _vehicle_of(vs: Dict[str, Any]) -> Dict[str, Any]:
+    # I payload arrivano da JSON: i tipi sono esattamente dict/list/str,
+    # quindi il confronto diretto sul tipo basta (ed è più economico di isinstance).
+    vehicle = vs.get("Vehicle")
+    return vehicle if type(vehicle) is dict else _EMPTY_VEHICLE
+
+
 def get_vehicle_code(vs: Dict[str, Any]) -> Optional[str]:
-    vehicle = vs.get("Vehicle") if isinstance(vs.get("Vehicle"), dict) else {}
-    code = vehicle.get("Code")
-    if isinstance(code, str) and code.strip():
-        return code.strip()
+    code = _vehicle_of(vs).get("Code")
+    if type(code) is str:
+        code = code.strip()
+        if code:
+            return code
     return None
 
 
 def get_vehicle_name(vs: Dict[str, Any]) -> Optional[str]:
-    vehicle = vs.get("Vehicle") if isinstance(vs.get("Vehicle"), dict) else {}
+    vehicle = _vehicle_of(vs)
     vmm = vehicle.get("VehMakeModel")
-    if isinstance(vmm, list) and vmm and isinstance(vmm[0], dict):
+    if type(vmm) is list and vmm and type(vmm[0]) is dict:
         name = vmm[0].get("Name")
-        if isinstance(name, str) and name.strip():
-            return name.strip()
+        if type(name) is str:
+            name = name.strip()
+            if name:
+                return name
     model = vehicle.get("model")
-    if isinstance(model, str) and model.strip():
-        return model.strip()
+    if type(model) is str:
+        model = model.strip()
+        if model:
+            return model
     return None
 
 
@@ -384,51 +542,104 @@ def extract_required_optionals_for_booking(vs: Dict[str, Any]) -> List[Dict[str,
     for opt in opts:
         if not isinstance(opt, dict):
             continue
-        charge = opt.get("Charge") if isinstance(opt.get("Charge"), dict) else {}
-        must_include = (
-            opt.get("Selected") is True
-            or charge.get("IncludedInRate") is True
-            or charge.get("IncludedInEstTotalInd") is True
-        )
-        if not must_include:
-            continue
+        # Selected per primo: se è già selezionato il Charge non va nemmeno letto.
+        if opt.get("Selected") is not True:
+            charge = opt.get("Charge")
+            if type(charge) is not dict or (
+                charge.get("IncludedInRate") is not True and charge.get("IncludedInEstTotalInd") is not True
+            ):
+                continue
         normalized = normalize_optional_for_booking(opt)
         if normalized:
             out.append(normalized)
     return out
 
 
+def to_float(value: Any) -> Optional[float]:
+    # Fast path sul tipo: il JSON decodificato porta già float; int, stringhe, Decimal,
+    # bool e sottoclassi numeriche passano da float() come prima (anche gli int, che
+    # oltre il range di un double sollevano OverflowError).
+    if type(value) is float:
+        return value
+    try:
+        return float(value)
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
 def extract_payment_amount_from_vehicle(vs: Dict[str, Any]) -> float:
     tc = get_vehicle_total_charge(vs)
     for key in ("RateTotalAmount", "EstimatedTotalAmount", "TotalAmount"):
-        value = tc.get(key)
-        if value is None:
-            continue
-        try:
-            return float(value)
-        except Exception:
-            continue
+        value = to_float(tc.get(key))
+        if value is not None:
+            return value
     return 0.0
 
 
-def choose_best_available_vehicle(vehicles: List[Dict[str, Any]]) -> Optional[Tuple[Dict[str, Any], float, float]]:
-    candidates: List[Tuple[Dict[str, Any], float, float]] = []
+OfferPick = Tuple[Dict[str, Any], float, float]
+
+
+@dataclass(frozen=True)
+class OfferRow:
+    """Campi di preview di un'offerta, estratti una sola volta dal dict veicolo."""
+
+    status: Any
+    vehicle_code: Optional[str]
+    name: Optional[str]
+    estimated_total: Any
+    rate_total: Any
+    optionals: int
 
-    for vs in vehicles:
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "Status": self.status,
+            "VehicleCode": self.vehicle_code,
+            "Name": self.name,
+            "EstimatedTotalAmount": self.estimated_total,
+            "RateTotalAmount": self.rate_total,
+            "Optionals": self.optionals,
+        }
+
+
+def summarize_vehicles(
+    vehicles: List[Dict[str, Any]],
+    preview: int = 5,
+) -> Tuple[List[OfferRow], Optional[OfferPick]]:
+    """
+    Un solo passaggio sui veicoli quotati: righe di preview per i primi
+    `preview` elementi e miglior offerta (prima tra i disponibili, altrimenti
+    il minimo globale su EstimatedTotalAmount).
+    """
+    rows: List[OfferRow] = []
+    best_available: Optional[OfferPick] = None
+    best_any: Optional[OfferPick] = None
+
+    for idx, vs in enumerate(vehicles):
         tc = get_vehicle_total_charge(vs)
-        try:
-            est = float(tc.get("EstimatedTotalAmount"))
-            pre = float(tc.get("RateTotalAmount"))
-            candidates.append((vs, est, pre))
-        except Exception:
+        est_raw = tc.get("EstimatedTotalAmount")
+        pre_raw = tc.get("RateTotalAmount")
+
+        if idx < preview:
+            rows.append(OfferRow(
+                status=vs.get("Status"),
+                vehicle_code=get_vehicle_code(vs),
+                name=get_vehicle_name(vs),
+                estimated_total=est_raw,
+                rate_total=pre_raw,
+                optionals=len(vs.get("optionals") or []),
+            ))
+
+        est = to_float(est_raw)
+        pre = to_float(pre_raw)
+        if est is None or pre is None:
             continue
 
-    if not candidates:
-        return None
+        if best_any is None or est < best_any[1]:
+            best_any = (vs, est, pre)
+        if (best_available is None or est < best_available[1]) and str(vs.get("Status", "")).lower() == "available":
+            best_available = (vs, est, pre)
 
-    available = [row for row in candidates if str(row[0].get("Status", "")).lower() == "available"]
-    pool = available if available else candidates
-    return min(pool, key=lambda x: x[1])
+    return rows, best_available or best_any
 
 
 def extract_quote_canonical_booking_datetimes(
@@ -461,24 +672,31 @@ def extract_quote_canonical_booking_datetimes(
 # BUILD PAYLOADS WRAPPER
 # =====================================================================================
 
+# Parte costante del payload quotations: costruita una sola volta all'import,
+# per ogni chiamata variano solo le date.
+_QUOTATION_PAYLOAD_STATIC: Dict[str, Any] = {
+    "age": DRIVER_AGE,
+    "channel": CHANNEL,
+    "showPics": SHOW_PICS,
+    "showOptionalImage": SHOW_OPTIONAL_IMAGE,
+    "showVehicleParameter": SHOW_VEHICLE_PARAMETER,
+    "showVehicleExtraImage": SHOW_VEHICLE_EXTRA_IMG,
+    "agreementCoupon": AGREEMENT_COUPON,
+    "discountValueWithoutVat": DISCOUNT_WO_VAT,
+    "macroDescription": MACRO_DESC,
+    "showBookingDiscount": SHOW_BOOKING_DISCOUNT,
+    "isYoungDriverAge": None,
+    "isSeniorDriverAge": None,
+}
+
+
 def build_quotation_payload(start_dt: datetime, end_dt: datetime) -> Dict[str, Any]:
     return {
         "pickupLocation": PICKUP_LOCATION,
         "dropOffLocation": DROPOFF_LOCATION,
         "startDate": iso_no_tz_seconds(start_dt),
         "endDate": iso_no_tz_seconds(end_dt),
-        "age": DRIVER_AGE,
-        "channel": CHANNEL,
-        "showPics": bool(SHOW_PICS),
-        "showOptionalImage": bool(SHOW_OPTIONAL_IMAGE),
-        "showVehicleParameter": bool(SHOW_VEHICLE_PARAMETER),
-        "showVehicleExtraImage": bool(SHOW_VEHICLE_EXTRA_IMG),
-        "agreementCoupon": AGREEMENT_COUPON,
-        "discountValueWithoutVat": DISCOUNT_WO_VAT,
-        "macroDescription": MACRO_DESC,
-        "showBookingDiscount": bool(SHOW_BOOKING_DISCOUNT),
-        "isYoungDriverAge": None,
-        "isSeniorDriverAge": None,
+        **_QUOTATION_PAYLOAD_STATIC,
     }
 
 
@@ -557,7 +775,7 @@ def extract_reservation_code_for_lookup(
     if not value:
         raise RuntimeError("Impossibile determinare reservationCode per il nuovo endpoint by-code")
 
-    return normalize_spaces(str(value))
+    return normalize_spaces(value)
 
 
 def extract_customer_email_for_lookup(
@@ -619,26 +837,48 @@ def test_health() -> Dict[str, Any]:
     return data
 
 
-def test_locations() -> List[Dict[str, Any]]:
+LOCATIONS_PATH = "/api/v1/touroperator/locations"
+
+
+def test_locations(
+    pending: Optional["Future[requests.Response]"] = None,
+) -> Tuple[List[Dict[str, Any]], Set[str]]:
     hrule(f"STEP 2 - LOCATIONS (source={SOURCE})")
     data = request_get(
-        "/api/v1/touroperator/locations",
+        LOCATIONS_PATH,
         params={"source": SOURCE},
+        pending=pending,
     )
 
     if not isinstance(data, list):
         raise RuntimeError("Payload locations inatteso: attesa lista")
 
     print(f"Locations trovate: {len(data)}")
-    for i, loc in enumerate(data[:20], start=1):
+
+    # Unico passaggio sulla lista: righe di preview (prime 20) e set dei codici.
+    rows: List[Dict[str, Any]] = []
+    codes: Set[str] = set()
+    for loc in data:
+        if not isinstance(loc, dict):
+            continue
         code = loc.get("locationCode")
-        name = loc.get("locationName")
-        city = loc.get("locationCity")
-        print(f"  {i:2d}) {code} - {name} ({city})")
-    return data
+        if code is not None:
+            codes.add(str(code).upper())
+        if len(rows) < 20:
+            rows.append({
+                "locationCode": code,
+                "locationName": loc.get("locationName"),
+                "locationCity": loc.get("locationCity"),
+            })
+
+    print_rows(
+        rows,
+        lambda i, r: f"  {i:2d}) {r['locationCode']} - {r['locationName']} ({r['locationCity']})",
+    )
+    return data, codes
 
 
-def test_quotations(payload: Dict[str, Any]) -> Dict[str, Any]:
+def test_quotations(payload: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Dict[str, Any]], Optional[OfferPick]]:
     hrule(f"STEP 3 - QUOTATIONS (source={SOURCE})")
     print("Payload quotations inviato alla wrapper:")
     jprint(payload)
@@ -657,7 +897,7 @@ def test_quotations(payload: Dict[str, Any]) -> Dict[str, Any]:
     print(f"Periodo: {qd.get('PickUpDateTime')} -> {qd.get('ReturnDateTime')}")
     print(f"Veicoli trovati: {qd.get('total')}")
 
-    best = choose_best_available_vehicle(vehicles)
+    rows, best = summarize_vehicles(vehicles)
     if best:
         best_vs, est, pre = best
         print(f"Miglior offerta: est/pre = {est} / {pre}")
@@ -667,17 +907,18 @@ def test_quotations(payload: Dict[str, Any]) -> Dict[str, Any]:
         print("Nessuna miglior offerta calcolabile")
 
     print("\nPrime 5 offerte:")
-    for idx, vs in enumerate(vehicles[:5], start=1):
-        tc = get_vehicle_total_charge(vs)
-        print(
-            f"  [{idx}] Status={vs.get('Status')} "
-            f"VehicleCode={get_vehicle_code(vs)} "
-            f"Name={get_vehicle_name(vs)} "
-            f"TotalCharge={tc.get('EstimatedTotalAmount')}/{tc.get('RateTotalAmount')} "
-            f"Optionals={len(vs.get('optionals') or [])}"
-        )
+    print_rows(
+        rows,
+        lambda i, r: (
+            f"  [{i}] Status={r.status} "
+            f"VehicleCode={r.vehicle_code} "
+            f"Name={r.name} "
+            f"TotalCharge={r.estimated_total}/{r.rate_total} "
+            f"Optionals={r.optionals}"
+        ),
+    )
 
-    return data
+    return data, vehicles, best
 
 
 def test_reservation_compose(payload: Dict[str, Any]) -> Dict[str, Any]:
@@ -800,20 +1041,20 @@ def print_wrapper_capability_notes() -> None:
 def main() -> None:
     collected: Dict[str, Any] = {}
 
+    # Le locations non dipendono dall'health check: le scarichiamo in parallelo
+    # (stesso pool della sessione) e le consumiamo allo step 2.
+    executor = ThreadPoolExecutor(max_workers=min(4, POOL_MAXSIZE))
+
     try:
+        locations_future = executor.submit(send_get, LOCATIONS_PATH, params={"source": SOURCE})
+
         # 1) HEALTH
         collected["health"] = test_health()
 
         # 2) LOCATIONS
-        locations = test_locations()
+        locations, location_codes = test_locations(pending=locations_future)
         collected["locations"] = locations
 
-        location_codes = {
-            str(x.get("locationCode")).upper()
-            for x in locations
-            if isinstance(x, dict) and x.get("locationCode") is not None
-        }
-
         if PICKUP_LOCATION.upper() not in location_codes or DROPOFF_LOCATION.upper() not in location_codes:
             hrule("ATTENZIONE LOCATION")
             print(
@@ -827,14 +1068,12 @@ def main() -> None:
         quotation_payload = build_quotation_payload(raw_start_dt, raw_end_dt)
         collected["quotation_request"] = quotation_payload
 
-        quotation_response = test_quotations(quotation_payload)
+        quotation_response, vehicles, best = test_quotations(quotation_payload)
         collected["quotation_response"] = quotation_response
 
-        vehicles = get_vehicles_from_quote(quotation_response)
         if not vehicles:
             raise RuntimeError("Nessun veicolo disponibile dalla quotazione wrapper")
 
-        best = choose_best_available_vehicle(vehicles)
         if not best:
             raise RuntimeError("Impossibile selezionare un veicolo dalla quotazione wrapper")
 
@@ -924,8 +1163,8 @@ def main() -> None:
         print_wrapper_capability_notes()
 
         if SAVE_OUTPUT_JSON:
-            with open(OUTPUT_JSON_PATH, "w", encoding="utf-8") as f:
-                json.dump(collected, f, indent=2, ensure_ascii=False, default=str)
+            with open(OUTPUT_JSON_PATH, "wb") as f:
+                f.write(_dumps_pretty(collected))
             print(f"\n[INFO] Output salvato in {OUTPUT_JSON_PATH}")
 
         hrule("FINE ✅")
@@ -944,6 +1183,9 @@ def main() -> None:
         print(repr(e))
         sys.exit(2)
 
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
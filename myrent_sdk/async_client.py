@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import asyncio
+from functools import partial
+from typing import Any, Callable, List, Optional, Sequence, TypeVar
+
+from .main import (
+    AuthResult,
+    BookingRequest,
+    BookingResponse,
+    BookingStatus,
+    CancelResult,
+    Location,
+    MyRentClient,
+    PaymentsRequest,
+    PaymentsResponse,
+    QuotationRequest,
+    QuotationResponse,
+)
+
+
+__all__ = [
+    "AsyncMyRentClient",
+]
+
+
+T = TypeVar("T")
+
+
+# =====================================================================================
+# CLIENT ASINCRONO
+# =====================================================================================
+
+class AsyncMyRentClient:
+    """
+    Variante asyncio di MyRentClient per lavori batch (stati/dettagli di molte prenotazioni).
+
+    Ogni chiamata gira su un thread tramite asyncio.to_thread, riusando il client sincrono
+    (stessa sessione e pool keep-alive, stessi retry e parser); un semaforo limita le
+    richieste in volo, da tenere non oltre il pool_maxsize della sessione.
+    """
+
+    def __init__(
+        self,
+        client: Optional[MyRentClient] = None,
+        *,
+        max_concurrency: int = 16,
+        **client_kwargs: Any,
+    ) -> None:
+        self.client = client or MyRentClient(**client_kwargs)
+        self.max_concurrency = int(max_concurrency)
+        # creato alla prima chiamata e legato al loop in cui gira: con un loop diverso
+        # (es. più asyncio.run sullo stesso client) se ne crea uno nuovo
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def _call(self, fn: Callable[..., T], *args: Any) -> T:
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        async with self._semaphore:
+            return await asyncio.to_thread(fn, *args)
+
+    # -------------------- Endpoint --------------------
+    async def authenticate(self) -> AuthResult:
+        return await self._call(self.client.authenticate)
+
+    async def get_locations(self) -> List[Location]:
+        return await self._call(self.client.get_locations)
+
+    async def get_quotations(self, request: QuotationRequest) -> QuotationResponse:
+        return await self._call(self.client.get_quotations, request)
+
+    async def payments(
+        self,
+        request: Optional[PaymentsRequest] = None,
+        *,
+        channel: Optional[str] = None,
+    ) -> PaymentsResponse:
+        return await self._call(partial(self.client.payments, request, channel=channel))
+
+    async def create_booking(self, request: BookingRequest) -> BookingResponse:
+        return await self._call(self.client.create_booking, request)
+
+    async def get_booking(self, booking_id: str, channel: Optional[str]) -> BookingResponse:
+        return await self._call(self.client.get_booking, booking_id, channel)
+
+    async def get_booking_status(self, booking_id: str) -> BookingStatus:
+        return await self._call(self.client.get_booking_status, booking_id)
+
+    async def cancel_booking(self, booking_id: str, channel: Optional[str]) -> CancelResult:
+        return await self._call(self.client.cancel_booking, booking_id, channel)
+
+    # -------------------- Batch --------------------
+    async def get_many_booking_status(self, booking_ids: Sequence[str]) -> List[BookingStatus]:
+        return list(await asyncio.gather(*(self.get_booking_status(b) for b in booking_ids)))
+
+    async def get_many_quotations(self, requests: Sequence[QuotationRequest]) -> List[QuotationResponse]:
+        # stesse date su più location (o più combinazioni di date): una richiesta per elemento,
+        # risultati nello stesso ordine delle richieste
+        return list(await asyncio.gather(*(self.get_quotations(r) for r in requests)))
+
+    async def get_many_bookings(self, booking_ids: Sequence[str], channel: Optional[str]) -> List[BookingResponse]:
+        return list(await asyncio.gather(*(self.get_booking(b, channel) for b in booking_ids)))
@@ -1,10 +1,20 @@
 from __future__ import annotations
 
 import json
-from datetime import datetime, timedelta
+import logging
+import os
+import re
+import sys
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from zoneinfo import ZoneInfo
 from typing import Any, Optional
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
 from myrent_sdk.main import (
     MyRentClient,
     LocationType,
@@ -43,28 +53,46 @@ FORCE_PAYMENT_TYPE = "---3BONIFICO---3"
 CREATE_BOOKING = True
 CANCEL_BOOKING = False
 
+# Il dump completo della quotazione (tutti i veicoli con optional e immagini) è
+# di gran lunga l'output più pesante della demo: disattivato salvo DEMO_DUMP_QUOTATION=1.
+DUMP_QUOTATION = os.environ.get("DEMO_DUMP_QUOTATION") == "1"
+
 ROME_TZ = ZoneInfo("Europe/Rome")
+_ZERO_OFFSET = timedelta(0)
 
 
 # =====================================================================================
 # DEBUG CLIENT
 # =====================================================================================
 
+def _preview(obj: Any, limit: int, *, indent: bool = False) -> str:
+    # Anteprima troncata per i log di debug: con orjson si tronca direttamente
+    # il buffer di bytes (il decode con "replace" gestisce un carattere spezzato).
+    if orjson is not None:
+        try:
+            raw = orjson.dumps(obj, default=str, option=orjson.OPT_INDENT_2 if indent else 0)
+            return raw[:limit].decode("utf-8", "replace")
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None, default=str)[:limit]
+
+
 class DebugMyRentClient(MyRentClient):
-    def _request(self, method: str, path: str, *, headers=None, json_body=None, params=None):
-        import json as _json
+    def _request(self, method: str, url: str, *, headers=None, json_body=None, params=None, stream=False):
         import requests as _requests
 
-        url = self.base_url + path
         attempt = 0
         last_exc: Optional[Exception] = None
         last_retryable_http: Optional[dict] = None
+        prev_delay: Optional[float] = None
+        token_refreshed = False
 
-        try:
-            if json_body is not None and ("booking" in path.lower()):
-                print("[DEBUG] OUTGOING JSON:", _json.dumps(json_body, ensure_ascii=False, indent=2)[:4000])
-        except Exception:
-            pass
+        # il dump del body (indentato, fino a 4000 caratteri) si costruisce solo con il logger a DEBUG
+        if json_body is not None and "booking" in url.lower() and self.log.isEnabledFor(logging.DEBUG):
+            try:
+                self.log.debug("OUTGOING JSON: %s", _preview(json_body, 4000, indent=True))
+            except Exception:
+                pass
 
         while attempt <= self.max_retries:
             try:
@@ -75,18 +103,28 @@ class DebugMyRentClient(MyRentClient):
                     json=json_body,
                     params=params,
                     timeout=self.timeout,
+                    stream=stream,
                 )
 
                 if 200 <= resp.status_code < 300:
                     return resp
 
                 if resp.status_code == 401:
+                    # stesso rinnovo del token di MyRentClient._request: una volta, senza consumare tentativi
+                    retry_headers = None if token_refreshed else self._refreshed_token_headers(method, url, headers)
+                    if retry_headers is not None:
+                        token_refreshed = True
+                        if stream:
+                            resp.close()
+                        print(f"[DEBUG] HTTP 401 on {method.upper()} {url}: token rinnovato, riprovo")
+                        headers = retry_headers
+                        continue
                     try:
                         payload = resp.json()
                     except Exception:
                         payload = {"raw": resp.text}
                     raise AuthenticationError(
-                        f"HTTP 401 {method} {url}: token non valido/scaduto | payload={_json.dumps(payload)[:800]}"
+                        f"HTTP 401 {method} {url}: token non valido/scaduto | payload={_preview(payload, 800)}"
                     )
 
                 if resp.status_code in (429,) or 500 <= resp.status_code < 600:
@@ -105,11 +143,12 @@ class DebugMyRentClient(MyRentClient):
                         f"(attempt {attempt+1}/{self.max_retries+1})"
                     )
                     if isinstance(last_retryable_http["body"], (dict, list)):
-                        print("[DEBUG] body:", _json.dumps(last_retryable_http["body"], ensure_ascii=False)[:1200])
+                        print("[DEBUG] body:", _preview(last_retryable_http["body"], 1200))
                     else:
                         print("[DEBUG] body:", str(last_retryable_http["body"])[:1200])
 
-                    self._sleep_backoff(attempt)
+                    retry_after = self._retry_after(resp) if resp.status_code == 429 else None
+                    prev_delay = self._sleep_backoff(attempt, retry_after, prev_delay)
                     attempt += 1
                     continue
 
@@ -117,11 +156,13 @@ class DebugMyRentClient(MyRentClient):
                     payload = resp.json()
                 except Exception:
                     payload = {"raw": resp.text}
-                raise APIError(f"HTTP {resp.status_code} {method} {url}: {_json.dumps(payload)[:1200]}")
+                raise APIError(f"HTTP {resp.status_code} {method} {url}: {_preview(payload, 1200)}")
 
             except (_requests.Timeout, _requests.ConnectionError) as exc:
+                if self._is_unrecoverable(exc):
+                    raise APIError(f"Request fallita (errore non recuperabile): {exc}") from exc
                 last_exc = exc
-                self._sleep_backoff(attempt)
+                prev_delay = self._sleep_backoff(attempt, None, prev_delay)
                 attempt += 1
                 continue
 
@@ -140,11 +181,14 @@ class DebugMyRentClient(MyRentClient):
 # =====================================================================================
 
 def _safe_get(d: Any, *keys, default=None):
+    # Le chiavi sono sempre stringhe: su list/str/None l'indicizzazione solleva
+    # TypeError, quindi basta un solo try invece di un isinstance per livello.
     cur = d
-    for k in keys:
-        if not isinstance(cur, dict):
-            return default
-        cur = cur.get(k)
+    try:
+        for k in keys:
+            cur = cur[k]
+    except (TypeError, KeyError):
+        return default
     return cur if cur is not None else default
 
 
@@ -159,25 +203,82 @@ def _to_dict(obj: Any) -> dict:
     return {}
 
 
+_ISO_DT_RE = re.compile(
+    r"^(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})(?:\.(\d{1,6})\d*)?(Z|[+-]\d{2}:?\d{2})?$"
+)
+
+
 def _parse_iso_dt(s: str) -> Optional[datetime]:
-    if not isinstance(s, str) or not s.strip():
+    # Le stesse date (PickUp/Return) ricorrono su tutte le quotazioni: cache sulla stringa.
+    if not isinstance(s, str):
         return None
+    return _parse_iso_dt_cached(s)
+
+
+@lru_cache(maxsize=4096)
+def _parse_iso_dt_cached(s: str) -> Optional[datetime]:
     s = s.strip()
-    if s.endswith("Z"):
+    if not s:
+        return None
+
+    m = _ISO_DT_RE.match(s)
+    if m:
+        y, mo, d, hh, mi, ss, frac, tz = m.groups()
+        tzinfo = None
+        try:
+            if tz == "Z":
+                tzinfo = timezone.utc
+            elif tz:
+                off_h, off_m = int(tz[1:3]), int(tz[-2:])
+                # offset fuori intervallo (es. +24:00, +01:75): data non valida, come fromisoformat
+                if off_h >= 24 or off_m >= 60:
+                    return None
+                offset = timedelta(hours=off_h, minutes=off_m)
+                tzinfo = timezone.utc if not offset else timezone(-offset if tz[0] == "-" else offset)
+            return datetime(
+                int(y), int(mo), int(d), int(hh), int(mi), int(ss),
+                int(frac.ljust(6, "0")) if frac else 0,
+                tzinfo=tzinfo,
+            )
+        except ValueError:
+            return None
+
+    return _parse_iso_dt_slow(s)
+
+
+# Da Python 3.11 fromisoformat accetta il suffisso "Z" così com'è.
+_FROMISOFORMAT_ACCEPTS_Z = sys.version_info >= (3, 11)
+_ISO_FRACTION_RE = re.compile(r"\.\d+(?=[+\-Z]|$)")
+
+
+def _parse_iso_dt_slow(s: str) -> Optional[datetime]:
+    if not _FROMISOFORMAT_ACCEPTS_Z and s.endswith("Z"):
         s = s[:-1] + "+00:00"
     try:
         return datetime.fromisoformat(s)
-    except Exception:
-        if "." in s:
-            s2 = s.split(".")[0] + s[s.find("+"):] if "+" in s else s.split(".")[0]
-            try:
-                return datetime.fromisoformat(s2)
-            except Exception:
-                return None
-        return None
+    except ValueError:
+        s2 = _ISO_FRACTION_RE.sub("", s, count=1)
+        if s2 == s:
+            return None
+        try:
+            return datetime.fromisoformat(s2)
+        except ValueError:
+            return None
 
 
 def _extract_quote_canonical_datetimes(quote_obj: Any) -> tuple[Optional[datetime], Optional[datetime]]:
+    # Con un QuotationResponse servono solo due campi del primo item: li leggiamo
+    # dagli attributi, senza serializzare tutta la quotazione (veicoli inclusi) con to_dict().
+    qlist = getattr(getattr(quote_obj, "data", None), "quotation", None)
+    if isinstance(qlist, list):
+        if not qlist:
+            return None, None
+        q0 = qlist[0]
+        return (
+            _parse_iso_dt(getattr(q0, "pick_up_date_time", None) or ""),
+            _parse_iso_dt(getattr(q0, "return_date_time", None) or ""),
+        )
+
     qd = _to_dict(quote_obj)
     q0 = _safe_get(qd, "data", "quotation", default=[])
     if not (isinstance(q0, list) and q0 and isinstance(q0[0], dict)):
@@ -187,8 +288,22 @@ def _extract_quote_canonical_datetimes(quote_obj: Any) -> tuple[Optional[datetim
     return pu, ret
 
 
+# Offset Europe/Rome per ora UTC: i cambi d'ora avvengono a ore UTC intere,
+# quindi dentro lo stesso bucket l'offset è costante.
+_ROME_OFFSET_BY_UTC_HOUR: dict = {}
+
+
 def _canonical_to_local_naive(dt_utc_aware: datetime) -> datetime:
-    return dt_utc_aware.astimezone(ROME_TZ).replace(tzinfo=None)
+    if dt_utc_aware.utcoffset() != _ZERO_OFFSET:
+        # naive o con offset diverso da UTC: conversione completa
+        return dt_utc_aware.astimezone(ROME_TZ).replace(tzinfo=None)
+
+    bucket = dt_utc_aware.toordinal() * 24 + dt_utc_aware.hour
+    off = _ROME_OFFSET_BY_UTC_HOUR.get(bucket)
+    if off is None:
+        off = dt_utc_aware.astimezone(ROME_TZ).utcoffset()
+        _ROME_OFFSET_BY_UTC_HOUR[bucket] = off
+    return (dt_utc_aware + off).replace(tzinfo=None)
 
 
 def _flatten_quotation_to_vehicle_list(quote_obj: Any) -> list[dict]:
@@ -198,6 +313,9 @@ def _flatten_quotation_to_vehicle_list(quote_obj: Any) -> list[dict]:
         qi0 = qlist[0]
         vs = getattr(qi0, "vehicles", None)
         if isinstance(vs, list):
+            # Caso normale: sono tutti dict, niente copia della lista.
+            if all(type(v) is dict for v in vs):
+                return vs
             return [v for v in vs if isinstance(v, dict)]
 
     qd = _to_dict(quote_obj)
@@ -210,67 +328,83 @@ def _flatten_quotation_to_vehicle_list(quote_obj: Any) -> list[dict]:
 
 
 def _extract_vehicle_code(vehicle: dict) -> Optional[str]:
-    vc = _safe_get(vehicle, "Vehicle", "Code")
-    if isinstance(vc, str) and vc.strip():
-        return vc.strip()
-    vc2 = _safe_get(vehicle, "Vehicle", "groupPic", "internationalCode")
-    if isinstance(vc2, str) and vc2.strip():
-        return vc2.strip()
-    return None
-
-
-def _normalize_optional_dict(o: dict) -> Optional[dict]:
-    equip_type = o.get("EquipType") or _safe_get(o, "Equipment", "EquipType") or _safe_get(o, "Equipment", "equipType")
-    if not equip_type:
+    v = vehicle.get("Vehicle")
+    if type(v) is not dict:
         return None
+    vc = v.get("Code")
+    if type(vc) is str:
+        vc = vc.strip()
+        if vc:
+            return vc
+    vc2 = _safe_get(v, "groupPic", "internationalCode")
+    if type(vc2) is str:
+        vc2 = vc2.strip()
+        if vc2:
+            return vc2
+    return None
 
-    qty = o.get("Quantity") or _safe_get(o, "Equipment", "Quantity") or 1
-    try:
-        qty = int(qty)
-    except Exception:
-        qty = 1
-    if qty <= 0:
-        qty = 1
-
-    prepaid = o.get("Prepaid")
-    if prepaid is None:
-        prepaid = False
 
-    return {
-        "EquipType": str(equip_type),
-        "Quantity": qty,
-        "Selected": True,
-        "Prepaid": bool(prepaid),
-    }
+_EMPTY: dict = {}
 
 
 def _extract_required_optionals_for_booking(vehicle: dict) -> list[dict]:
+    """
+    Optional da inviare nel booking (selezionati o inclusi in tariffa/totale),
+    già normalizzati: filtro e normalizzazione in un solo passaggio.
+    """
     opts = vehicle.get("optionals")
-    if not isinstance(opts, list):
+    if type(opts) is not list:
         return []
 
     out: list[dict] = []
+    app = out.append
     for o in opts:
-        if not isinstance(o, dict):
+        if type(o) is not dict:
             continue
-        charge = o.get("Charge") if isinstance(o.get("Charge"), dict) else {}
-        must_include = (
-            o.get("Selected") is True
-            or charge.get("IncludedInRate") is True
-            or charge.get("IncludedInEstTotalInd") is True
-        )
-        if not must_include:
+        if o.get("Selected") is not True:
+            charge = o.get("Charge")
+            if type(charge) is not dict or (
+                charge.get("IncludedInRate") is not True and charge.get("IncludedInEstTotalInd") is not True
+            ):
+                continue
+
+        equip = o.get("Equipment")
+        if type(equip) is not dict:
+            equip = _EMPTY
+
+        equip_type = o.get("EquipType") or equip.get("EquipType") or equip.get("equipType")
+        if not equip_type:
             continue
-        nd = _normalize_optional_dict(o)
-        if nd:
-            out.append(nd)
+
+        qty = o.get("Quantity") or equip.get("Quantity") or 1
+        if type(qty) is not int:
+            try:
+                qty = int(qty)
+            except (TypeError, ValueError, OverflowError):
+                qty = 1
+        if qty <= 0:
+            qty = 1
+
+        app({
+            "EquipType": str(equip_type),
+            "Quantity": qty,
+            "Selected": True,
+            "Prepaid": bool(o.get("Prepaid")),
+        })
     return out
 
 
 def _make_birth_date_iso(start_dt: datetime, driver_age: int) -> str:
-    year = start_dt.year - driver_age
-    bd = datetime(year, start_dt.month, min(start_dt.day, 28), 0, 0, 0)
-    return bd.isoformat(timespec="seconds")
+    return _birth_date_iso(start_dt.year, start_dt.month, start_dt.day, driver_age)
+
+
+@lru_cache(maxsize=128)
+def _birth_date_iso(year: int, month: int, day: int, driver_age: int) -> str:
+    # giorno limitato a 28: evita date inesistenti (es. 29/02 su anno non bisestile)
+    return f"{year - driver_age:04d}-{month:02d}-{min(day, 28):02d}T00:00:00"
+
+
+_WIRE_TRANSFER_KEYS = frozenset(("wiretransfer", "wire_transfer"))
 
 
 def _choose_payment_type(pay_resp_obj: Any) -> Optional[str]:
@@ -282,32 +416,42 @@ def _choose_payment_type(pay_resp_obj: Any) -> Optional[str]:
     if not isinstance(raw, dict) or not raw:
         return None
 
-    keys = {k.lower() for k in raw.keys()}
-    if "wiretransfer" in keys or "wire_transfer" in keys:
-        return "BONIFICO"
-    if any("paypal" in k for k in keys):
-        return "PayPal"
-    if any("nexi" in k for k in keys):
-        return "CREDITCARDDEFERRED"
-    if any("stripe" in k for k in keys):
-        return "CREDITCARDDEFERRED"
-    return "BONIFICO"
+    # Un solo passaggio sulle chiavi, con la stessa precedenza di prima:
+    # bonifico (match esatto) > PayPal > Nexi/Stripe > default bonifico.
+    found = None
+    for k in raw:
+        kl = k.lower()
+        if kl in _WIRE_TRANSFER_KEYS:
+            return "BONIFICO"
+        if found != "PayPal":
+            if "paypal" in kl:
+                found = "PayPal"
+            elif found is None and ("nexi" in kl or "stripe" in kl):
+                found = "CREDITCARDDEFERRED"
+    return found or "BONIFICO"
 
 
 def _extract_error(booking_resp: Any) -> tuple[Optional[int], Optional[str]]:
     raw = getattr(booking_resp, "raw", None)
-    if not isinstance(raw, dict):
+    if type(raw) is not dict:
         raw = _to_dict(booking_resp)
+
     err = _safe_get(raw, "data", "errors", "Error")
-    if isinstance(err, dict):
-        code = err.get("Code")
-        txt = err.get("ShortText")
+    if type(err) is not dict:
+        return None, None
+
+    code = err.get("Code")
+    if type(code) is not int:
         try:
             code = int(code)
-        except Exception:
-            pass
-        return code if isinstance(code, int) else None, txt if isinstance(txt, str) else None
-    return None, None
+        except (TypeError, ValueError, OverflowError):
+            code = None
+    txt = err.get("ShortText")
+    return code, txt if type(txt) is str else None
+
+
+def _is_available(status: Any) -> bool:
+    return status == "Available" or (type(status) is str and status.lower() == "available")
 
 
 def _extract_payment_amount_from_vehicle(vehicle: dict) -> float:
@@ -373,7 +517,22 @@ def main():
     )
 
     quote = client.get_quotations(req)
-    print(json.dumps(quote.to_dict(), indent=2, ensure_ascii=False))
+    if DUMP_QUOTATION:
+        if orjson is not None:
+            data = orjson.dumps(quote.to_dict(), option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+            out = getattr(sys.stdout, "buffer", None)
+            sys.stdout.flush()
+            if out is not None:
+                out.write(data)
+                out.flush()
+            else:
+                # stdout senza buffer binario (StringIO, output catturato)
+                sys.stdout.write(data.decode("utf-8"))
+        else:
+            print(json.dumps(quote.to_dict(), indent=2, ensure_ascii=False))
+    else:
+        n_vehicles = sum(len(q.vehicles) for q in quote.data.quotation)
+        print(f"Quotazione ricevuta: {n_vehicles} veicoli (DEMO_DUMP_QUOTATION=1 per il dump completo)")
 
     canonical_start, canonical_end = _extract_quote_canonical_datetimes(quote)
     if canonical_start and canonical_end:
@@ -415,13 +574,35 @@ def main():
 
     birth_date_iso = _make_birth_date_iso(booking_start_dt, DRIVER_AGE)
 
+    # Cliente identico per tutti i tentativi: costruito una volta sola fuori dal loop.
+    customer = BookingCustomer(
+        first_name="Mario",
+        last_name="Rossi",
+        email="mario.rossi@example.com",
+        mobile_number="+393331234567",
+        country="IT",
+        city="Bari",
+        zip="70121",
+        street="Via Roma",
+        num="1",
+        tax_code="RSSMRA80A01H501U",
+        birth_date=birth_date_iso,
+        birth_place="Bari",
+        birth_province="BA",
+    )
+
     booking_id = None
     last_error = None
 
-    for idx, vehicle in enumerate(vehicles, start=1):
-        if str(vehicle.get("Status", "")).lower() != "available":
-            continue
+    # Prefiltro dei soli disponibili: il payload usa "Available", il lower()
+    # resta solo come fallback per varianti di maiuscole.
+    candidates = [
+        (idx, vehicle)
+        for idx, vehicle in enumerate(vehicles, start=1)
+        if _is_available(vehicle.get("Status"))
+    ]
 
+    for idx, vehicle in candidates:
         vehicle_code = _extract_vehicle_code(vehicle)
         if not vehicle_code:
             continue
@@ -445,21 +626,7 @@ def main():
             vehicle_code=vehicle_code,
             channel=CHANNEL,
             optionals=optionals,
-            customer=BookingCustomer(
-                first_name="Mario",
-                last_name="Rossi",
-                email="mario.rossi@example.com",
-                mobile_number="+393331234567",
-                country="IT",
-                city="Bari",
-                zip="70121",
-                street="Via Roma",
-                num="1",
-                tax_code="RSSMRA80A01H501U",
-                birth_date=birth_date_iso,
-                birth_place="Bari",
-                birth_province="BA",
-            ),
+            customer=customer,
             vehicle_request=vehicle_request,
         )
 
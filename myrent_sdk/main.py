@@ -1,15 +1,41 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field, asdict
-from typing import Any, Dict, List, Optional, Union
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, fields
+from typing import Any, ClassVar, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 from datetime import datetime
+from functools import lru_cache
+from itertools import repeat
+from operator import attrgetter
 import time
 import json
 import logging
+import math
+import random
 import re
+import sys
+import threading
 from urllib.parse import quote
 
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import ijson
+    from ijson.common import ObjectBuilder
+except ImportError:  # pragma: no cover
+    ijson = None  # type: ignore[assignment]
+    ObjectBuilder = None  # type: ignore[assignment,misc]
+
+try:
+    from urllib3.exceptions import NameResolutionError
+except ImportError:  # pragma: no cover - urllib3 < 2
+    NameResolutionError = None  # type: ignore[assignment,misc]
 
 
 __all__ = [
@@ -40,6 +66,10 @@ __all__ = [
 ]
 
 
+# slots=True per dataclass è disponibile solo da Python 3.10.
+_DATACLASS_SLOTS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
 # =====================================================================================
 # Eccezioni
 # =====================================================================================
@@ -60,62 +90,161 @@ class APIError(MyRentError):
 # Helper di parsing e normalizzazione
 # =====================================================================================
 
-_ISO_NO_SECONDS = re.compile(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}$")
-_ISO_WITH_SECONDS = re.compile(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}$")
-
-
 def _normalize_base_url(base_url: str) -> str:
     return base_url.rstrip("/")
 
 
+_TRUE_STRINGS = frozenset(("true", "t", "1", "yes", "y"))
+_FALSE_STRINGS = frozenset(("false", "f", "0", "no", "n"))
+
+
+# I coercer vengono chiamati per ogni campo dei payload (centinaia di location):
+# prima il dispatch sul tipo esatto dei valori JSON, try/except solo come fallback.
+
 def _coerce_bool(v: Any) -> Optional[bool]:
     if v is None:
         return None
-    if isinstance(v, bool):
+    t = type(v)
+    if t is bool:
         return v
-    if isinstance(v, (int, float)):
-        return bool(v)
     if isinstance(v, str):
         s = v.strip().lower()
-        if s in {"true", "t", "1", "yes", "y"}:
+        if s in _TRUE_STRINGS:
             return True
-        if s in {"false", "f", "0", "no", "n"}:
+        if s in _FALSE_STRINGS:
             return False
+        return None
+    if isinstance(v, (int, float)):
+        return bool(v)
     return None
 
 
 def _coerce_float(v: Any) -> Optional[float]:
+    if v is None:
+        return None
+    t = type(v)
+    if t is float:
+        return v
     try:
-        return float(v) if v is not None else None
-    except Exception:
+        return float(v)
+    except (TypeError, ValueError, OverflowError):
         return None
 
 
 def _coerce_int(v: Any) -> Optional[int]:
+    if v is None:
+        return None
+    t = type(v)
+    if t is int:
+        return v
+    if t is float:
+        return int(v) if math.isfinite(v) else None
     try:
-        if isinstance(v, float) and v.is_integer():
-            return int(v)
-        return int(v) if v is not None else None
-    except Exception:
+        return int(v)
+    except (TypeError, ValueError, OverflowError):
         return None
 
 
 def _fmt_dt_iso_seconds(dt: Union[str, datetime]) -> str:
-    if isinstance(dt, datetime):
-        return dt.replace(microsecond=0).strftime("%Y-%m-%dT%H:%M:%S")
     if isinstance(dt, str):
-        s = dt.strip()
-        if _ISO_WITH_SECONDS.match(s):
-            return s
-        if _ISO_NO_SECONDS.match(s):
-            return f"{s}:00"
-        return s
+        # caso più comune: stringa già completa YYYY-MM-DDTHH:MM:SS, restituita così com'è
+        if len(dt) == 19 and dt[10] == "T" and dt[16] == ":" and dt[18].isdigit():
+            return dt
+        return _fmt_iso_str_seconds(dt)
+    if isinstance(dt, datetime):
+        return f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d}T{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}"
     raise TypeError("start_date/end_date devono essere str o datetime")
 
 
+@lru_cache(maxsize=4096)
+def _fmt_iso_str_seconds(dt: str) -> str:
+    # Formati attesi a lunghezza fissa: YYYY-MM-DDTHH:MM[:SS]. Bastano lunghezza
+    # e posizione dei separatori, senza passare dal motore regex.
+    s = dt.strip()
+    n = len(s)
+    if n == 16 and s[4] == "-" and s[7] == "-" and s[10] == "T" and s[13] == ":":
+        return f"{s}:00"
+    return s
+
+
+def _response_json(resp: requests.Response) -> Any:
+    # orjson parsa direttamente i bytes del body; se fallisce (es. body non UTF-8)
+    # si ricade su resp.json(), che gestisce l'encoding e solleva gli errori di sempre.
+    if orjson is not None:
+        try:
+            return orjson.loads(resp.content)
+        except orjson.JSONDecodeError:
+            pass
+    return resp.json()
+
+
+def _json_dumps(obj: Any, *, indent: bool = False) -> str:
+    # Serializzazione per log ed errori: orjson se disponibile, stdlib per i casi che
+    # orjson rifiuta (chiavi non stringa, tipi non nativi).
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode()
+        except TypeError:
+            pass
+    return json.dumps(obj, indent=2 if indent else None)
+
+
+def _has_non_finite_float(obj: Any) -> bool:
+    # Visita iterativa di dict/list/tuple alla ricerca di NaN/inf. Le foglie comuni
+    # (str, None, int, bool, float) si controllano sul posto senza passare dallo stack.
+    isfinite = math.isfinite
+    stack = [obj]
+    push = stack.append
+    while stack:
+        node = stack.pop()
+        t = type(node)
+        if t is dict or (t is not list and t is not tuple and isinstance(node, dict)):
+            values = node.values()
+        elif t is list or t is tuple or isinstance(node, (list, tuple)):
+            values = node
+        elif isinstance(node, float):
+            if not isfinite(node):
+                return True
+            continue
+        else:
+            continue
+        for v in values:
+            tv = type(v)
+            if tv is float:
+                if not isfinite(v):
+                    return True
+            elif v is not None and tv is not str and tv is not int and tv is not bool:
+                push(v)
+    return False
+
+
+def _encode_json_body(obj: Any) -> bytes:
+    # Corpo della richiesta serializzato una sola volta in bytes (inviato con data=).
+    # NaN/inf sono rifiutati come faceva requests con json= (allow_nan=False).
+    try:
+        if orjson is not None:
+            try:
+                data = orjson.dumps(obj)
+            except TypeError:
+                pass
+            else:
+                # orjson scrive i float non finiti come null: solo se compare un null si
+                # cercano nel payload, senza serializzarlo una seconda volta
+                if b"null" in data and _has_non_finite_float(obj):
+                    raise ValueError("Out of range float values are not JSON compliant")
+                return data
+        return json.dumps(obj, allow_nan=False).encode("utf-8")
+    except ValueError as exc:
+        raise requests.exceptions.InvalidJSONError(exc) from exc
+
+
+# primo carattere di whitespace (spazi, tab, a capo) in un channel, scansione unica in C
+_CHANNEL_WS = re.compile(r"\s").search
+
+
 def _sanitize_channel(channel: Optional[str]) -> Optional[str]:
-    if channel is None:
-        return None
+    if channel is None or " " not in channel:
+        return channel
     return channel.replace(" ", "")
 
 
@@ -128,6 +257,22 @@ def _maybe_strip(s: Any) -> Optional[str]:
     return str(s)
 
 
+def _as_list(v: Any) -> List[Any]:
+    # Le liste JSON decodificate sono già list: si tiene il riferimento senza copiarle.
+    if type(v) is list:
+        return v
+    return list(v or [])
+
+
+def _dict_items(node: List[Any]) -> List[Dict[str, Any]]:
+    # Nelle risposte ben formate tutti gli elementi sono dict: si restituisce la lista
+    # originale e si filtra (copiando) solo se compare un elemento di altro tipo.
+    for x in node:
+        if type(x) is not dict:
+            return [y for y in node if isinstance(y, dict)]
+    return node
+
+
 def _encode_path_segment(value: str) -> str:
     return quote((value or "").strip(), safe="")
 
@@ -147,7 +292,7 @@ def _nested_get(d: Any, *keys: str, default: Any = None) -> Any:
 # SCHEMI (Authentication + Locations)
 # =====================================================================================
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class AuthResult:
     user_id: int
     username: str
@@ -179,10 +324,16 @@ class AuthResult:
         )
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            "user_id": self.user_id,
+            "username": self.username,
+            "token_value": self.token_value,
+            "user_role": self.user_role,
+            "raw": self.raw,
+        }
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class OpeningHours:
     day_of_the_week: Optional[int] = None
     day_of_the_week_name: Optional[str] = None
@@ -225,7 +376,7 @@ class OpeningHours:
         }
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class Location:
     location_code: Optional[str] = None
     location_name: Optional[str] = None
@@ -265,44 +416,45 @@ class Location:
 
     @staticmethod
     def from_api_dict(d: Dict[str, Any]) -> "Location":
-        openings_payload = d.get("openings") or []
+        g = d.get
+        openings_payload = g("openings") or ()
         openings = [OpeningHours.from_api_dict(x) for x in openings_payload if isinstance(x, dict)]
         return Location(
-            location_code=d.get("locationCode"),
-            location_name=d.get("locationName"),
-            location_address=d.get("locationAddress"),
-            location_number=d.get("locationNumber"),
-            province=d.get("province"),
-            location_city=d.get("locationCity"),
-            location_type=_coerce_int(d.get("locationType")),
-            telephone_number=d.get("telephoneNumber"),
-            cell_number=d.get("cellNumber"),
-            email=d.get("email"),
-            latitude=_coerce_float(d.get("latitude")),
-            longitude=_coerce_float(d.get("longitude")),
-            is_airport=_coerce_bool(d.get("isAirport")),
-            is_railway=_coerce_bool(d.get("isRailway")),
-            is_always_opentrue=_coerce_bool(d.get("isAlwaysOpentrue")),
-            is_car_sharing_enabled=_coerce_bool(d.get("isCarSharingEnabled")),
-            allow_pickup_dropoff_out_of_hours=_coerce_bool(d.get("allowPickUpDropOffOutOfHours")),
-            has_key_box=_coerce_bool(d.get("hasKeyBox")),
-            morning_start_time=d.get("morningStartTime"),
-            morning_stop_time=d.get("morningStopTime"),
-            afternoon_start_time=d.get("afternoonStartTime"),
-            afternoon_stop_time=d.get("afternoonStopTime"),
-            location_info_en=d.get("locationInfoEN"),
-            location_info_local=d.get("locationInfoLocal"),
+            location_code=g("locationCode"),
+            location_name=g("locationName"),
+            location_address=g("locationAddress"),
+            location_number=g("locationNumber"),
+            province=g("province"),
+            location_city=g("locationCity"),
+            location_type=_coerce_int(g("locationType")),
+            telephone_number=g("telephoneNumber"),
+            cell_number=g("cellNumber"),
+            email=g("email"),
+            latitude=_coerce_float(g("latitude")),
+            longitude=_coerce_float(g("longitude")),
+            is_airport=_coerce_bool(g("isAirport")),
+            is_railway=_coerce_bool(g("isRailway")),
+            is_always_opentrue=_coerce_bool(g("isAlwaysOpentrue")),
+            is_car_sharing_enabled=_coerce_bool(g("isCarSharingEnabled")),
+            allow_pickup_dropoff_out_of_hours=_coerce_bool(g("allowPickUpDropOffOutOfHours")),
+            has_key_box=_coerce_bool(g("hasKeyBox")),
+            morning_start_time=g("morningStartTime"),
+            morning_stop_time=g("morningStopTime"),
+            afternoon_start_time=g("afternoonStartTime"),
+            afternoon_stop_time=g("afternoonStopTime"),
+            location_info_en=g("locationInfoEN"),
+            location_info_local=g("locationInfoLocal"),
             openings=openings,
-            closing=list(d.get("closing") or []),
-            festivity=list(d.get("festivity") or []),
-            minimum_lead_time_in_hour=_coerce_int(d.get("minimumLeadTimeInHour")),
-            country=d.get("country"),
-            zip_code=d.get("zipCode"),
-            public_web_description_en=d.get("publicWebDescriptionEN"),
-            public_web_description=d.get("publicWebDescription"),
-            is_out_of_hours=_coerce_bool(d.get("isOutOfHours")),
-            only_dropoff_out_of_hours=_coerce_bool(d.get("onlyDropOffOutOfHours")),
-            dropoff_address=d.get("dropOffAddress"),
+            closing=_as_list(g("closing")),
+            festivity=_as_list(g("festivity")),
+            minimum_lead_time_in_hour=_coerce_int(g("minimumLeadTimeInHour")),
+            country=g("country"),
+            zip_code=g("zipCode"),
+            public_web_description_en=g("publicWebDescriptionEN"),
+            public_web_description=g("publicWebDescription"),
+            is_out_of_hours=_coerce_bool(g("isOutOfHours")),
+            only_dropoff_out_of_hours=_coerce_bool(g("onlyDropOffOutOfHours")),
+            dropoff_address=g("dropOffAddress"),
         )
 
     def to_dict(self) -> Dict[str, Any]:
@@ -355,8 +507,14 @@ class LocationType:
 # SCHEMI (Quotations)
 # =====================================================================================
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class QuotationRequest:
+    # Il backend storico legge anche la chiave "isyoungDriverAge" (refuso); impostare
+    # a False per non inviarla verso installazioni che accettano solo "isYoungDriverAge".
+    # Flag di classe: va cambiato su QuotationRequest o su una sottoclasse, non su
+    # un'istanza (con gli slots, da Python 3.10, l'assegnazione solleva AttributeError).
+    EMIT_LEGACY_YOUNG_DRIVER_KEY: ClassVar[bool] = True
+
     drop_off_location: str
     end_date: Union[str, datetime]
     pickup_location: str
@@ -387,32 +545,37 @@ class QuotationRequest:
         if self.channel is not None:
             payload["channel"] = _sanitize_channel(self.channel)
 
-        opt_map: Dict[str, Any] = {
-            "showPics": self.show_pics,
-            "showOptionalImage": self.show_optional_image,
-            "showVehicleParameter": self.show_vehicle_parameter,
-            "showVehicleExtraImage": self.show_vehicle_extra_image,
-            "discountValueWithoutVat": self.discount_value_without_vat,
-            "macroDescription": self.macro_description,
-            "showBookingDiscount": self.show_booking_discount,
-            "isYoungDriverAge": self.is_young_driver_age,
-            "isSeniorDriverAge": self.is_senior_driver_age,
-        }
-
-        if isinstance(self.agreement_coupon, str) and self.agreement_coupon.strip():
-            payload["agreementCoupon"] = self.agreement_coupon.strip()
-
-        for k, v in opt_map.items():
-            if v is not None:
-                payload[k] = v
-
+        if isinstance(self.agreement_coupon, str):
+            coupon = self.agreement_coupon.strip()
+            if coupon:
+                payload["agreementCoupon"] = coupon
+
+        if self.show_pics is not None:
+            payload["showPics"] = self.show_pics
+        if self.show_optional_image is not None:
+            payload["showOptionalImage"] = self.show_optional_image
+        if self.show_vehicle_parameter is not None:
+            payload["showVehicleParameter"] = self.show_vehicle_parameter
+        if self.show_vehicle_extra_image is not None:
+            payload["showVehicleExtraImage"] = self.show_vehicle_extra_image
+        if self.discount_value_without_vat is not None:
+            payload["discountValueWithoutVat"] = self.discount_value_without_vat
+        if self.macro_description is not None:
+            payload["macroDescription"] = self.macro_description
+        if self.show_booking_discount is not None:
+            payload["showBookingDiscount"] = self.show_booking_discount
         if self.is_young_driver_age is not None:
+            payload["isYoungDriverAge"] = self.is_young_driver_age
+        if self.is_senior_driver_age is not None:
+            payload["isSeniorDriverAge"] = self.is_senior_driver_age
+
+        if self.is_young_driver_age is not None and self.EMIT_LEGACY_YOUNG_DRIVER_KEY:
             payload["isyoungDriverAge"] = self.is_young_driver_age
 
         return payload
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class QuotationItem:
     total: Optional[int] = None
     pick_up_location: Optional[str] = None
@@ -430,8 +593,8 @@ class QuotationItem:
             return_location=d.get("ReturnLocation"),
             pick_up_date_time=d.get("PickUpDateTime"),
             return_date_time=d.get("ReturnDateTime"),
-            vehicles=list(d.get("Vehicles") or []),
-            optionals=list(d.get("optionals") or []),
+            vehicles=_as_list(d.get("Vehicles")),
+            optionals=_as_list(d.get("optionals")),
         )
 
     def to_dict(self) -> Dict[str, Any]:
@@ -446,7 +609,7 @@ class QuotationItem:
         }
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class QuotationData:
     quotation: List[QuotationItem] = field(default_factory=list)
     total_charge: Dict[str, Any] = field(default_factory=dict)
@@ -459,7 +622,7 @@ class QuotationData:
             return QuotationData(quotation=[item], total_charge=total_charge)
 
         q_list = d.get("quotation") or []
-        items = [QuotationItem.from_api_dict(x) for x in q_list if isinstance(x, dict)]
+        items = list(map(QuotationItem.from_api_dict, _dict_items(q_list)))
         total_charge = d.get("TotalCharge") or {}
         return QuotationData(quotation=items, total_charge=total_charge)
 
@@ -470,7 +633,7 @@ class QuotationData:
         }
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class QuotationResponse:
     data: QuotationData
     raw: Dict[str, Any] = field(default_factory=dict)
@@ -479,7 +642,7 @@ class QuotationResponse:
     def from_api_payload(payload: Dict[str, Any]) -> "QuotationResponse":
         data_obj = payload.get("data") or payload.get("Data") or {}
         if isinstance(data_obj, list):
-            items = [QuotationItem.from_api_dict(x) for x in data_obj if isinstance(x, dict)]
+            items = list(map(QuotationItem.from_api_dict, _dict_items(data_obj)))
             qdata = QuotationData(quotation=items, total_charge={})
         elif isinstance(data_obj, dict):
             qdata = QuotationData.from_api_dict(data_obj)
@@ -503,7 +666,7 @@ class PaymentsRequest:
         return {"language": self.language}
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class PaymentsResponse:
     raw: Dict[str, Any] = field(default_factory=dict)
 
@@ -514,7 +677,7 @@ class PaymentsResponse:
         return PaymentsResponse(raw={"raw": payload})
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {"raw": self.raw}
 
 
 # =====================================================================================
@@ -541,6 +704,28 @@ class BookingOptional:
         return d
 
 
+# Campi stringa opzionali di BookingCompanyInfo: (chiave payload, attributo). Chiavi e
+# getter sono calcolati una volta sola, to_dict() non ricostruisce la mappa a ogni chiamata.
+_COMPANY_INFO_STR_FIELDS = (
+    ("CompanyPhoneNumber", "company_phone_number"),
+    ("CompanyEmail", "company_email"),
+    ("CompanyEInvoicingCode", "company_e_invoicing_code"),
+    ("CompanyEInvoicingEmail", "company_e_invoicing_email"),
+    ("CompanyBirthCity", "company_birth_city"),
+    ("CompanyBirthProv", "company_birth_prov"),
+    ("CompanyBirthCountry", "company_birth_country"),
+    ("CompanyStreet", "company_street"),
+    ("CompanyStreetNumber", "company_street_number"),
+    ("CompanyCityName", "company_city_name"),
+    ("CompanyPostalCode", "company_postal_code"),
+    ("CompanyStateProv", "company_state_prov"),
+    ("CompanyCountry", "company_country"),
+    ("CompanyName", "company_name"),
+)
+_COMPANY_INFO_STR_KEYS = tuple(k for k, _ in _COMPANY_INFO_STR_FIELDS)
+_COMPANY_INFO_STR_VALUES = attrgetter(*(a for _, a in _COMPANY_INFO_STR_FIELDS))
+
+
 @dataclass
 class BookingCompanyInfo:
     company_phone_number: Optional[str] = None
@@ -559,25 +744,12 @@ class BookingCompanyInfo:
     company_country: Optional[str] = None
     company_name: Optional[str] = None
 
+    def _has_any(self) -> bool:
+        return _COMPANY_INFO_ALL_VALUES(self).count(None) < _COMPANY_INFO_FIELD_COUNT
+
     def to_dict(self) -> Dict[str, Any]:
         d: Dict[str, Any] = {}
-        mapping = {
-            "CompanyPhoneNumber": self.company_phone_number,
-            "CompanyEmail": self.company_email,
-            "CompanyEInvoicingCode": self.company_e_invoicing_code,
-            "CompanyEInvoicingEmail": self.company_e_invoicing_email,
-            "CompanyBirthCity": self.company_birth_city,
-            "CompanyBirthProv": self.company_birth_prov,
-            "CompanyBirthCountry": self.company_birth_country,
-            "CompanyStreet": self.company_street,
-            "CompanyStreetNumber": self.company_street_number,
-            "CompanyCityName": self.company_city_name,
-            "CompanyPostalCode": self.company_postal_code,
-            "CompanyStateProv": self.company_state_prov,
-            "CompanyCountry": self.company_country,
-            "CompanyName": self.company_name,
-        }
-        for k, v in mapping.items():
+        for k, v in zip(_COMPANY_INFO_STR_KEYS, _COMPANY_INFO_STR_VALUES(self)):
             vv = _maybe_strip(v)
             if vv is not None:
                 d[k] = vv
@@ -591,6 +763,43 @@ class BookingCompanyInfo:
         return d
 
 
+# Tutti i campi in un solo attrgetter: _has_any() verifica con tuple.count(None) se
+# l'oggetto è completamente vuoto, senza passare da to_dict().
+_COMPANY_INFO_ALL_VALUES = attrgetter(*(f.name for f in fields(BookingCompanyInfo)))
+_COMPANY_INFO_FIELD_COUNT = len(fields(BookingCompanyInfo))
+
+
+# Campi stringa opzionali di BookingCustomer (stesso schema di BookingCompanyInfo).
+_CUSTOMER_STR_FIELDS = (
+    ("clientId", "client_id"),
+    ("ragioneSociale", "ragione_sociale"),
+    ("codice", "codice"),
+    ("street", "street"),
+    ("num", "num"),
+    ("city", "city"),
+    ("zip", "zip"),
+    ("country", "country"),
+    ("state", "state"),
+    ("phNum1", "ph_num1"),
+    ("phNum2", "ph_num2"),
+    ("mobileNumber", "mobile_number"),
+    ("email", "email"),
+    ("vatNumber", "vat_number"),
+    ("birthPlace", "birth_place"),
+    ("birthProvince", "birth_province"),
+    ("birthNation", "birth_nation"),
+    ("taxCode", "tax_code"),
+    ("document", "document"),
+    ("documentNumber", "document_number"),
+    ("licenceType", "licence_type"),
+    ("issueBy", "issue_by"),
+    ("eInvoiceEmail", "e_invoice_email"),
+    ("eInvoiceCode", "e_invoice_code"),
+)
+_CUSTOMER_STR_KEYS = tuple(k for k, _ in _CUSTOMER_STR_FIELDS)
+_CUSTOMER_STR_VALUES = attrgetter(*(a for _, a in _CUSTOMER_STR_FIELDS))
+
+
 @dataclass
 class BookingCustomer:
     first_name: Optional[str] = None
@@ -627,6 +836,9 @@ class BookingCustomer:
     is_physical_person: Optional[Union[str, bool]] = None
     is_individual_company: Optional[Union[str, bool]] = None
 
+    def _has_any(self) -> bool:
+        return _CUSTOMER_ALL_VALUES(self).count(None) < _CUSTOMER_FIELD_COUNT
+
     def to_dict(self) -> Dict[str, Any]:
         d: Dict[str, Any] = {}
 
@@ -639,33 +851,7 @@ class BookingCustomer:
             d["Surname"] = ln
             d["lastName"] = ln
 
-        mapping = {
-            "clientId": self.client_id,
-            "ragioneSociale": self.ragione_sociale,
-            "codice": self.codice,
-            "street": self.street,
-            "num": self.num,
-            "city": self.city,
-            "zip": self.zip,
-            "country": self.country,
-            "state": self.state,
-            "phNum1": self.ph_num1,
-            "phNum2": self.ph_num2,
-            "mobileNumber": self.mobile_number,
-            "email": self.email,
-            "vatNumber": self.vat_number,
-            "birthPlace": self.birth_place,
-            "birthProvince": self.birth_province,
-            "birthNation": self.birth_nation,
-            "taxCode": self.tax_code,
-            "document": self.document,
-            "documentNumber": self.document_number,
-            "licenceType": self.licence_type,
-            "issueBy": self.issue_by,
-            "eInvoiceEmail": self.e_invoice_email,
-            "eInvoiceCode": self.e_invoice_code,
-        }
-        for k, v in mapping.items():
+        for k, v in zip(_CUSTOMER_STR_KEYS, _CUSTOMER_STR_VALUES(self)):
             vv = _maybe_strip(v)
             if vv is not None:
                 d[k] = vv
@@ -697,6 +883,10 @@ class BookingCustomer:
         return d
 
 
+_CUSTOMER_ALL_VALUES = attrgetter(*(f.name for f in fields(BookingCustomer)))
+_CUSTOMER_FIELD_COUNT = len(fields(BookingCustomer))
+
+
 @dataclass
 class BookingFee:
     currency_code: Optional[str] = None
@@ -704,13 +894,17 @@ class BookingFee:
     amount: Optional[Union[str, int, float]] = None
 
     def to_dict(self) -> Dict[str, Any]:
+        # conversione solo se il valore non è già del tipo atteso dal payload
         d: Dict[str, Any] = {}
-        if self.currency_code is not None:
-            d["CurrencyCode"] = str(self.currency_code)
-        if self.description is not None:
-            d["Description"] = str(self.description)
-        if self.amount is not None:
-            d["Amount"] = str(self.amount)
+        v = self.currency_code
+        if v is not None:
+            d["CurrencyCode"] = v if type(v) is str else str(v)
+        v = self.description
+        if v is not None:
+            d["Description"] = v if type(v) is str else str(v)
+        v = self.amount
+        if v is not None:
+            d["Amount"] = v if type(v) is str else str(v)
         return d
 
 
@@ -724,16 +918,21 @@ class BookingVehicleRequest:
 
     def to_dict(self) -> Dict[str, Any]:
         d: Dict[str, Any] = {}
-        if self.payment_type is not None:
-            d["PaymentType"] = str(self.payment_type)
-        if self.type is not None:
-            d["type"] = str(self.type)
-        if self.payment_amount is not None:
-            d["PaymentAmount"] = float(self.payment_amount)
-        if self.payment_transaction_type_code is not None:
-            d["PaymentTransactionTypeCode"] = str(self.payment_transaction_type_code)
-        if self.voucher_number is not None:
-            d["VoucherNumber"] = str(self.voucher_number)
+        v = self.payment_type
+        if v is not None:
+            d["PaymentType"] = v if type(v) is str else str(v)
+        v = self.type
+        if v is not None:
+            d["type"] = v if type(v) is str else str(v)
+        v = self.payment_amount
+        if v is not None:
+            d["PaymentAmount"] = v if type(v) is float else float(v)
+        v = self.payment_transaction_type_code
+        if v is not None:
+            d["PaymentTransactionTypeCode"] = v if type(v) is str else str(v)
+        v = self.voucher_number
+        if v is not None:
+            d["VoucherNumber"] = v if type(v) is str else str(v)
         return d
 
 
@@ -809,15 +1008,17 @@ class BookingRequest:
         if self.is_senior_driver_age is not None:
             payload["isSeniorDriverAge"] = bool(self.is_senior_driver_age)
 
-        if isinstance(self.agreement_coupon, str) and self.agreement_coupon.strip():
-            payload["agreementCoupon"] = self.agreement_coupon.strip()
+        if isinstance(self.agreement_coupon, str):
+            coupon = self.agreement_coupon.strip()
+            if coupon:
+                payload["agreementCoupon"] = coupon
 
-        if self.company_info is not None:
+        if self.company_info is not None and self.company_info._has_any():
             ci = self.company_info.to_dict()
             if ci:
                 payload["CompanyInfo"] = ci
 
-        if self.customer is not None:
+        if self.customer is not None and self.customer._has_any():
             cu = self.customer.to_dict()
             if cu:
                 payload["Customer"] = cu
@@ -835,7 +1036,7 @@ class BookingRequest:
         return payload
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class Booking:
     id: Optional[str] = None
     db_id: Optional[str] = None
@@ -878,24 +1079,34 @@ class Booking:
     raw: Dict[str, Any] = field(default_factory=dict)
 
     @staticmethod
-    def from_api_dict(d: Dict[str, Any]) -> "Booking":
-        vehicle = d.get("Vehicle") if isinstance(d.get("Vehicle"), dict) else {}
-        total_charge = d.get("TotalCharge") if isinstance(d.get("TotalCharge"), dict) else {}
-        rental_rate = d.get("RentalRate") if isinstance(d.get("RentalRate"), dict) else {}
-        customer = d.get("customer") if isinstance(d.get("customer"), dict) else {}
+    def from_api_dict(d: Dict[str, Any], keep_raw: bool = True) -> "Booking":
+        # catene "or" inline con d.get legato una volta: più rapide di un loop su una tupla di chiavi
+        g = d.get
+        vehicle = g("Vehicle")
+        if not isinstance(vehicle, dict):
+            vehicle = {}
+        total_charge = g("TotalCharge")
+        if not isinstance(total_charge, dict):
+            total_charge = {}
+        rental_rate = g("RentalRate")
+        if not isinstance(rental_rate, dict):
+            rental_rate = {}
+        customer = g("customer")
+        if not isinstance(customer, dict):
+            customer = {}
 
         return Booking(
-            id=_maybe_strip(d.get("id") or d.get("Id") or d.get("bookingId") or d.get("BookingId")),
-            db_id=_maybe_strip(d.get("dbId") or d.get("DbId")),
-            status=_maybe_strip(d.get("Status") or d.get("status")),
-            type=_maybe_strip(d.get("Type") or d.get("type")),
-            company_name=_maybe_strip(d.get("CompanyName") or d.get("companyName")),
-            url=_maybe_strip(d.get("URL") or d.get("Url") or d.get("url")),
-
-            pick_up_date_time=_maybe_strip(d.get("PickUpDateTime") or d.get("pickUpDateTime")),
-            pick_up_location=_maybe_strip(d.get("PickUpLocation") or d.get("pickUpLocation")),
-            return_date_time=_maybe_strip(d.get("ReturnDateTime") or d.get("returnDateTime")),
-            return_location=_maybe_strip(d.get("ReturnLocation") or d.get("returnLocation")),
+            id=_maybe_strip(g("id") or g("Id") or g("bookingId") or g("BookingId")),
+            db_id=_maybe_strip(g("dbId") or g("DbId")),
+            status=_maybe_strip(g("Status") or g("status")),
+            type=_maybe_strip(g("Type") or g("type")),
+            company_name=_maybe_strip(g("CompanyName") or g("companyName")),
+            url=_maybe_strip(g("URL") or g("Url") or g("url")),
+
+            pick_up_date_time=_maybe_strip(g("PickUpDateTime") or g("pickUpDateTime")),
+            pick_up_location=_maybe_strip(g("PickUpLocation") or g("pickUpLocation")),
+            return_date_time=_maybe_strip(g("ReturnDateTime") or g("returnDateTime")),
+            return_location=_maybe_strip(g("ReturnLocation") or g("returnLocation")),
 
             vehicle_code=_maybe_strip(vehicle.get("Code") or vehicle.get("code")),
             vehicle_make_model=_maybe_strip(_nested_get(vehicle, "VehMakeModel", "Name")),
@@ -918,31 +1129,67 @@ class Booking:
             customer_mobile_number=_maybe_strip(customer.get("mobileNumber")),
             customer_tax_code=_maybe_strip(customer.get("taxCode")),
 
-            vendor=_maybe_strip(d.get("Vendor") or d.get("vendor")),
+            vendor=_maybe_strip(g("Vendor") or g("vendor")),
 
-            optionals=list(d.get("optionals") or []),
-            payment_role=list(d.get("paymentRole") or []),
-            location_details=list(d.get("LocationDetails") or []),
+            optionals=_as_list(g("optionals")),
+            payment_role=_as_list(g("paymentRole")),
+            location_details=_as_list(g("LocationDetails")),
             rental_rate=rental_rate,
             total_charge=total_charge,
             vehicle=vehicle,
             customer=customer,
-            raw=d,
+            raw=d if keep_raw else {},
         )
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            "id": self.id,
+            "db_id": self.db_id,
+            "status": self.status,
+            "type": self.type,
+            "company_name": self.company_name,
+            "url": self.url,
+            "pick_up_date_time": self.pick_up_date_time,
+            "pick_up_location": self.pick_up_location,
+            "return_date_time": self.return_date_time,
+            "return_location": self.return_location,
+            "vehicle_code": self.vehicle_code,
+            "vehicle_make_model": self.vehicle_make_model,
+            "vehicle_brand": self.vehicle_brand,
+            "vehicle_model": self.vehicle_model,
+            "vehicle_plate_no": self.vehicle_plate_no,
+            "rate_total_amount": self.rate_total_amount,
+            "estimated_total_amount": self.estimated_total_amount,
+            "currency_code": self.currency_code,
+            "customer_id": self.customer_id,
+            "customer_first_name": self.customer_first_name,
+            "customer_last_name": self.customer_last_name,
+            "customer_email": self.customer_email,
+            "customer_mobile_number": self.customer_mobile_number,
+            "customer_tax_code": self.customer_tax_code,
+            "vendor": self.vendor,
+            "optionals": self.optionals,
+            "payment_role": self.payment_role,
+            "location_details": self.location_details,
+            "rental_rate": self.rental_rate,
+            "total_charge": self.total_charge,
+            "vehicle": self.vehicle,
+            "customer": self.customer,
+            "raw": self.raw,
+        }
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class BookingResponse:
     data: List[Booking] = field(default_factory=list)
     raw: Dict[str, Any] = field(default_factory=dict)
 
     @staticmethod
-    def from_api_payload(payload: Any) -> "BookingResponse":
+    def from_api_payload(payload: Any, keep_raw: bool = True) -> "BookingResponse":
+        # keep_raw=False: niente riferimenti al JSON originale, che può essere liberato
+        # appena estratti i campi tipizzati (liste di prenotazioni lunghe)
         if not isinstance(payload, dict):
-            return BookingResponse(data=[], raw={"raw": payload})
+            return BookingResponse(data=[], raw={"raw": payload} if keep_raw else {})
 
         node = payload.get("data")
         if node is None:
@@ -950,14 +1197,14 @@ class BookingResponse:
 
         items: List[Dict[str, Any]] = []
         if isinstance(node, list):
-            items = [x for x in node if isinstance(x, dict)]
+            items = _dict_items(node)
         elif isinstance(node, dict):
             items = [node]
         elif any(k in payload for k in ("id", "Id", "bookingId", "BookingId")):
             items = [payload]
 
-        bookings = [Booking.from_api_dict(x) for x in items]
-        return BookingResponse(data=bookings, raw=payload)
+        bookings = list(map(Booking.from_api_dict, items, repeat(keep_raw)))
+        return BookingResponse(data=bookings, raw=payload if keep_raw else {})
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -966,7 +1213,7 @@ class BookingResponse:
         }
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class BookingStatus:
     id: Optional[str] = None
     status: Optional[str] = None
@@ -991,10 +1238,14 @@ class BookingStatus:
         )
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            "id": self.id,
+            "status": self.status,
+            "raw": self.raw,
+        }
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class CancelResult:
     id: Optional[str] = None
     cancel_status: Optional[str] = None
@@ -1024,13 +1275,36 @@ class CancelResult:
         )
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            "id": self.id,
+            "cancel_status": self.cancel_status,
+            "raw": self.raw,
+        }
 
 
 # =====================================================================================
 # Client HTTP
 # =====================================================================================
 
+@lru_cache(maxsize=None)
+def _default_logger(name: str) -> logging.Logger:
+    # Configurato una sola volta per nome: i client successivi riusano il logger già pronto.
+    log = logging.getLogger(name)
+    if not log.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+        log.addHandler(handler)
+        log.setLevel(logging.INFO)
+    return log
+
+
+_ERR_366_TIPS = (
+    "Possibili cause: channel non abilitato ('Abilita per Booking' non spuntato) "
+    "oppure valore di 'channel' non valido (p.es. spazi non permessi). "
+    "Verificare in MyRent la convenzione e riprovare."
+)
+
+
 class MyRentClient:
     AUTH_PATH = "/api/v1/touroperator/authentication"
     LOCATIONS_PATH = "/api/v1/touroperator/locations"
@@ -1052,11 +1326,21 @@ class MyRentClient:
         timeout: Union[int, float] = 30,
         max_retries: int = 3,
         backoff_factor: float = 0.5,
+        max_backoff: float = 30.0,
         user_agent: Optional[str] = None,
         logger: Optional[logging.Logger] = None,
         session: Optional[requests.Session] = None,
+        pool_maxsize: int = 20,
+        locations_ttl: float = 600.0,
     ) -> None:
         self.base_url = _normalize_base_url(base_url)
+        # URL completi calcolati una volta: _request riceve l'URL, non il path
+        self._url_auth = self.base_url + self.AUTH_PATH
+        self._url_locations = self.base_url + self.LOCATIONS_PATH
+        self._url_quotations = self.base_url + self.QUOTATIONS_PATH
+        self._url_payments = self.base_url + self.PAYMENTS_PATH
+        self._url_bookings = self.base_url + self.BOOKINGS_PATH
+        self._url_booking_prefix = self._url_bookings + "/"
         self.user_id = user_id
         self.password = password
         self.company_code = company_code
@@ -1064,85 +1348,182 @@ class MyRentClient:
         self.timeout = float(timeout)
         self.max_retries = int(max_retries)
         self.backoff_factor = float(backoff_factor)
+        self.max_backoff = float(max_backoff)
+        # cache in-process delle locations: (token, istante monotonic, lista, indice per codice);
+        # ttl <= 0 la disattiva
+        self.locations_ttl = float(locations_ttl)
+        self._locations_cache: Optional[Tuple[str, float, List[Location], Dict[str, Location]]] = None
+        # ultimo risultato di _require_channel: (channel richiesto, company_code, channel finale)
+        self._channel_memo: Optional[Tuple[Optional[str], Optional[str], str]] = None
+        self._auth_headers: Optional[Dict[str, str]] = None
+        # serializza il rinnovo del token dopo un 401 fra thread che condividono il client
+        self._auth_lock = threading.Lock()
         self.user_agent = user_agent or "myrent-sdk/0.6"
-        self.log = logger or logging.getLogger("myrent_sdk")
-        if not self.log.handlers:
-            handler = logging.StreamHandler()
-            handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
-            self.log.addHandler(handler)
-            self.log.setLevel(logging.INFO)
-        self.session = session or requests.Session()
-
-    # -------------------- HTTP low-level --------------------
-    def _headers(self, extra: Optional[Dict[str, str]] = None) -> Dict[str, str]:
-        h = {
+        self.log = logger or _default_logger("myrent_sdk")
+        static_headers = {
             "User-Agent": self.user_agent,
             "Accept": "application/json",
             "Content-Type": "application/json",
         }
-        if extra:
-            h.update(extra)
-        return h
+        # header statici da unire per richiesta; None se già impostati sulla sessione
+        self._static_headers: Optional[Dict[str, str]] = static_headers
+        if session is None:
+            # pool dimensionato per chiamate concorrenti dallo stesso client (keep-alive);
+            # i retry restano gestiti da _request, non dall'adapter
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize, pool_block=False)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            # sessione propria: header statici impostati una volta, requests li unisce a
+            # quelli per-request; una sessione del chiamante invece non si modifica
+            session.headers.update(static_headers)
+            self._static_headers = None
+        self.session = session
 
-    def _sleep_backoff(self, attempt: int) -> None:
-        delay = self.backoff_factor * (2 ** attempt)
-        self.log.debug("retry fra %.2fs", delay)
+    # -------------------- HTTP low-level --------------------
+    def _headers(self, extra: Optional[Dict[str, str]] = None) -> Optional[Dict[str, str]]:
+        static = self._static_headers
+        if static is None:
+            return extra
+        if not extra:
+            return static
+        return {**static, **extra}
+
+    def _sleep_backoff(
+        self,
+        attempt: int,
+        retry_after: Optional[float] = None,
+        prev_delay: Optional[float] = None,
+    ) -> float:
+        if retry_after is not None:
+            # il server ha indicato quanto attendere (429): si attende per intero, perché
+            # un retry anticipato prende solo un altro 429; oltre max_backoff si rinuncia subito
+            if retry_after > self.max_backoff:
+                raise APIError(
+                    f"HTTP 429: Retry-After di {retry_after:g}s oltre max_backoff ({self.max_backoff:g}s)"
+                )
+            delay = retry_after
+        else:
+            # decorrelated jitter: attesa casuale fra la base e il triplo della precedente,
+            # con tetto; i client che ritentano insieme si desincronizzano da soli
+            prev = prev_delay if prev_delay is not None else self.backoff_factor
+            delay = min(self.max_backoff, random.uniform(self.backoff_factor, prev * 3))
+        self.log.debug("retry %d fra %.2fs", attempt + 1, delay)
         time.sleep(delay)
+        return delay
+
+    def _refreshed_token_headers(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]],
+    ) -> Optional[Dict[str, str]]:
+        # Header da usare per ripetere una richiesta respinta con 401, dopo il rinnovo del
+        # token; None se la richiesta non usa il token o mancano le credenziali.
+        if headers is None or "tokenValue" not in headers:
+            return None
+        if not (self.user_id and self.password and self.company_code):
+            return None
+        rejected = headers["tokenValue"]
+        with self._auth_lock:
+            # se un altro thread ha già sostituito il token respinto si riusa il suo
+            if self._token_value == rejected:
+                self.log.info("HTTP 401 %s %s: rinnovo token e riprovo", method, url)
+                self.authenticate()
+        return {**headers, "tokenValue": self.token_value}
+
+    @staticmethod
+    def _retry_after(resp: requests.Response) -> Optional[float]:
+        value = resp.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            seconds = float(value)
+        except ValueError:
+            return None
+        return seconds if math.isfinite(seconds) and seconds >= 0 else None
+
+    @staticmethod
+    def _is_unrecoverable(exc: Exception) -> bool:
+        # DNS non risolto e handshake TLS fallito non si risolvono ritentando
+        if isinstance(exc, requests.exceptions.SSLError):
+            return True
+        reason = getattr(exc.args[0], "reason", None) if exc.args else None
+        return NameResolutionError is not None and isinstance(reason, NameResolutionError)
 
     def _request(
         self,
         method: str,
-        path: str,
+        url: str,
         *,
         headers: Optional[Dict[str, str]] = None,
         json_body: Optional[Dict[str, Any]] = None,
         params: Optional[Dict[str, Any]] = None,
+        stream: bool = False,
     ) -> requests.Response:
-        url = self.base_url + path
         attempt = 0
         last_exc: Optional[Exception] = None
+        token_refreshed = False
+        prev_delay: Optional[float] = None
+        body = _encode_json_body(json_body) if json_body is not None else None
 
         while attempt <= self.max_retries:
             try:
-                if self.log.isEnabledFor(logging.DEBUG) and json_body is not None:
-                    self.log.debug("REQUEST %s %s body=%s", method.upper(), url, json.dumps(json_body, indent=2))
+                if body is not None and self.log.isEnabledFor(logging.DEBUG):
+                    self.log.debug("REQUEST %s %s body=%s", method.upper(), url, body.decode("utf-8"))
 
                 resp = self.session.request(
                     method=method.upper(),
                     url=url,
                     headers=self._headers(headers),
-                    json=json_body,
+                    data=body,
                     params=params,
                     timeout=self.timeout,
+                    stream=stream,
                 )
                 if 200 <= resp.status_code < 300:
                     return resp
 
                 if resp.status_code == 401:
+                    # token scaduto: una sola ri-autenticazione, poi si ripete la stessa
+                    # richiesta senza consumare un tentativo
+                    retry_headers = None if token_refreshed else self._refreshed_token_headers(method, url, headers)
+                    if retry_headers is not None:
+                        token_refreshed = True
+                        if stream:
+                            resp.close()
+                        headers = retry_headers
+                        continue
                     try:
-                        payload = resp.json()
+                        payload = _response_json(resp)
                     except Exception:
                         payload = {"raw": resp.text}
                     raise AuthenticationError(
-                        f"HTTP 401 {method} {url}: token non valido/scaduto | payload={json.dumps(payload)[:800]}"
+                        f"HTTP 401 {method} {url}: token non valido/scaduto | payload={_json_dumps(payload)[:800]}"
                     )
 
                 if resp.status_code in (429,) or 500 <= resp.status_code < 600:
-                    self._sleep_backoff(attempt)
+                    retry_after = self._retry_after(resp) if resp.status_code == 429 else None
+                    if stream:
+                        # body non letto: si chiude per restituire la connessione al pool
+                        resp.close()
+                    prev_delay = self._sleep_backoff(attempt, retry_after, prev_delay)
                     attempt += 1
                     continue
 
                 try:
-                    payload = resp.json()
+                    payload = _response_json(resp)
                 except Exception:
                     payload = {"raw": resp.text}
                 raise APIError(
-                    f"HTTP {resp.status_code} {method} {url}: {json.dumps(payload)[:800]}"
+                    f"HTTP {resp.status_code} {method} {url}: {_json_dumps(payload)[:800]}"
                 )
 
             except (requests.Timeout, requests.ConnectionError) as exc:
+                if self._is_unrecoverable(exc):
+                    raise APIError(f"Request fallita (errore non recuperabile): {exc}") from exc
                 last_exc = exc
-                self._sleep_backoff(attempt)
+                prev_delay = self._sleep_backoff(attempt, None, prev_delay)
                 attempt += 1
                 continue
 
@@ -1154,22 +1535,24 @@ class MyRentClient:
 
     @staticmethod
     def _parse_json(resp: requests.Response) -> Any:
-        ct = (resp.headers.get("Content-Type") or "").lower()
-        if "application/json" in ct or "json" in ct:
-            return resp.json()
+        # il body si prova sempre come JSON, a prescindere dal Content-Type dichiarato
         try:
-            return resp.json()
-        except Exception:
+            return _response_json(resp)
+        except ValueError:
             return resp.text
 
     def _require_channel(self, channel: Optional[str]) -> str:
-        ch = _sanitize_channel(channel)
+        company_code = self.company_code
+        memo = self._channel_memo
+        if memo is not None and memo[0] == channel and memo[1] == company_code:
+            return memo[2]
+        # _sanitize_channel rimuove già tutti gli spazi: nessun controllo ulteriore sul risultato
+        ch = _sanitize_channel(channel) if channel else None
         if not ch:
-            ch = _sanitize_channel(self.company_code)
+            ch = _sanitize_channel(company_code)
         if not ch:
             raise APIError("channel mancante e company_code non impostato sul client.")
-        if " " in ch:
-            raise APIError(f"Il channel contiene spazi non validi: '{ch}'")
+        self._channel_memo = (channel, company_code, ch)
         return ch
 
     # -------------------- Authentication --------------------
@@ -1179,12 +1562,13 @@ class MyRentClient:
                 "Servono user_id, password e company_code per authenticate()."
             )
         payload = dict(UserId=self.user_id, Password=self.password, companyCode=self.company_code)
-        resp = self._request("POST", self.AUTH_PATH, json_body=payload)
+        resp = self._request("POST", self._url_auth, json_body=payload)
         data = self._parse_json(resp)
         if not isinstance(data, dict):
             raise APIError("Formato inatteso della risposta di authentication.")
         auth = AuthResult.from_api_payload(data)
         self._token_value = auth.token_value
+        self._locations_cache = None
         return auth
 
     @property
@@ -1195,76 +1579,176 @@ class MyRentClient:
             )
         return self._token_value
 
+    def _token_headers(self) -> Dict[str, str]:
+        # dict {"tokenValue": ...} riusato finché il token non cambia: va trattato in sola
+        # lettura (requests non lo modifica; chi aggiunge header ne costruisce uno nuovo)
+        token = self.token_value
+        cached = self._auth_headers
+        if cached is None or cached["tokenValue"] != token:
+            cached = self._auth_headers = {"tokenValue": token}
+        return cached
+
     # -------------------- Locations --------------------
-    def get_locations(self) -> List[Location]:
-        headers = {"tokenValue": self.token_value}
-        resp = self._request("GET", self.LOCATIONS_PATH, headers=headers)
+    def _load_locations(self) -> Tuple[List[Location], Dict[str, Location]]:
+        # lista parsata + indice per codice (maiuscolo), dalla cache se ancora valida
+        token = self.token_value
+        cached = self._locations_cache
+        if (
+            cached is not None
+            and cached[0] == token
+            and time.monotonic() - cached[1] < self.locations_ttl
+        ):
+            return cached[2], cached[3]
+
+        resp = self._request("GET", self._url_locations, headers=self._token_headers())
         payload = self._parse_json(resp)
 
-        if isinstance(payload, dict) and isinstance(payload.get("result"), list):
-            raw_list = payload["result"]
-        elif isinstance(payload, dict) and isinstance(payload.get("data"), list):
-            raw_list = payload["data"]
-        elif isinstance(payload, list):
-            raw_list = payload
-        else:
+        raw_list: Any = payload
+        if isinstance(payload, dict):
+            raw_list = payload.get("result")
+            if not isinstance(raw_list, list):
+                raw_list = payload.get("data")
+        if not isinstance(raw_list, list):
             self.log.warning("Formato payload locations inatteso; forzo in lista.")
             raw_list = [payload]
 
-        return [Location.from_api_dict(x) for x in raw_list if isinstance(x, dict)]
+        locations = list(map(Location.from_api_dict, _dict_items(raw_list)))
+        # a parità di codice vince la prima location, come nella vecchia scansione lineare
+        by_code: Dict[str, Location] = {}
+        for loc in locations:
+            by_code.setdefault((loc.location_code or "").upper(), loc)
+        if self.locations_ttl > 0:
+            # chiave = token attuale: un 401 durante la richiesta può averlo rinnovato
+            self._locations_cache = (self._token_value, time.monotonic(), locations, by_code)
+        return locations, by_code
+
+    def get_locations(self) -> List[Location]:
+        # copia della lista: il chiamante può modificarla senza alterare la cache
+        return list(self._load_locations()[0])
+
+    def refresh_locations(self) -> List[Location]:
+        # scarta la cache e rilegge subito le locations dal server
+        self._locations_cache = None
+        return self.get_locations()
 
     def get_locations_by_type(self, location_type: int) -> List[Location]:
-        return [loc for loc in self.get_locations() if loc.location_type == location_type]
+        return [loc for loc in self._load_locations()[0] if loc.location_type == location_type]
 
     def find_location_by_code(self, code: str) -> Optional[Location]:
-        code = (code or "").strip().upper()
-        for loc in self.get_locations():
-            if (loc.location_code or "").upper() == code:
-                return loc
-        return None
+        return self._load_locations()[1].get((code or "").strip().upper())
 
     # -------------------- Quotations --------------------
-    def get_quotations(self, request: QuotationRequest) -> QuotationResponse:
-        headers = {"tokenValue": self.token_value}
+    def _quotation_payload(self, request: QuotationRequest) -> Dict[str, Any]:
         payload = request.to_payload()
 
-        if "channel" not in payload:
-            payload["channel"] = self._require_channel(None)
+        channel = payload.get("channel")
+        if channel is None:
+            payload["channel"] = channel = self._require_channel(None)
 
-        if " " in payload.get("channel", ""):
-            raise APIError(f"Il channel contiene spazi non validi: '{payload['channel']}'")
+        if _CHANNEL_WS(channel):
+            raise APIError(f"Il channel contiene spazi non validi: '{channel}'")
+        return payload
+
+    @staticmethod
+    def _raise_quotation_error(raw: Dict[str, Any]) -> None:
+        # data.errors.Error con controllo di tipo a ogni livello ("data" può essere
+        # anche una lista); nessun dict temporaneo nel caso di successo
+        data_node = raw.get("data")
+        err_node = data_node.get("errors") if isinstance(data_node, dict) else None
+        if isinstance(err_node, dict):
+            err_node = err_node.get("Error")
+        if not isinstance(err_node, dict):
+            err_node = None
+        short_text = err_node.get("ShortText") if err_node is not None else None
+
+        if short_text or str(raw.get("status", "")).lower() == "error":
+            code = _coerce_int(err_node.get("Code")) if err_node is not None else None
+            if code == 366:
+                raise APIError(
+                    f"Quotations error (code=366): {short_text}. {_ERR_366_TIPS} | payload={_json_dumps(raw)[:500]}"
+                )
+            raise APIError(
+                f"Quotations error (code={code}): {short_text} | payload={_json_dumps(raw)[:500]}"
+            )
+
+    def get_quotations(self, request: QuotationRequest) -> QuotationResponse:
+        headers = self._token_headers()
+        payload = self._quotation_payload(request)
 
-        resp = self._request("POST", self.QUOTATIONS_PATH, headers=headers, json_body=payload)
+        resp = self._request("POST", self._url_quotations, headers=headers, json_body=payload)
 
+        # body decodificato una sola volta: lo stesso oggetto serve al controllo errori e al parsing
         try:
-            raw = resp.json()
+            raw = _response_json(resp)
         except Exception:
-            raw = {"raw": resp.text}
-
-        if isinstance(raw, dict):
-            status = str(raw.get("status", "")).lower()
-            err_node = (((raw.get("data") or {}).get("errors") or {}).get("Error") or {})
-            short_text = err_node.get("ShortText")
-            code = _coerce_int(err_node.get("Code"))
-
-            if status == "error" or short_text:
-                if code == 366:
-                    tips = (
-                        "Possibili cause: channel non abilitato ('Abilita per Booking' non spuntato) "
-                        "oppure valore di 'channel' non valido (p.es. spazi non permessi). "
-                        "Verificare in MyRent la convenzione e riprovare."
-                    )
-                    raise APIError(
-                        f"Quotations error (code=366): {short_text}. {tips} | payload={json.dumps(raw)[:500]}"
-                    )
-                raise APIError(
-                    f"Quotations error (code={code}): {short_text} | payload={json.dumps(raw)[:500]}"
-                )
+            raw = None
+        if not isinstance(raw, dict):
+            raise APIError("Formato inatteso della risposta di quotations.")
 
-        data = self._parse_json(resp)
-        if not isinstance(data, dict):
+        self._raise_quotation_error(raw)
+        return QuotationResponse.from_api_payload(raw)
+
+    def iter_quotations(self, request: QuotationRequest) -> Iterator[QuotationItem]:
+        """
+        Come get_quotations, ma restituisce le QuotationItem una alla volta.
+
+        Con ijson installato la risposta è letta in streaming e ogni elemento di
+        data.quotation viene costruito e ceduto appena completo, senza tenere in memoria
+        l'intero albero JSON; senza ijson il body è decodificato per intero. La richiesta
+        parte alla prima iterazione.
+
+        A differenza di get_quotations, gli errori dell'API (data.errors.Error, status
+        "error") sono verificati solo a fine risposta, dopo gli elementi: l'APIError può
+        arrivare quando alcune QuotationItem sono già state cedute, e in quel caso vanno
+        scartate. Lo stesso ordine vale con e senza ijson.
+        """
+        headers = self._token_headers()
+        payload = self._quotation_payload(request)
+
+        if ijson is None:
+            resp = self._request("POST", self._url_quotations, headers=headers, json_body=payload)
+            try:
+                raw = _response_json(resp)
+            except Exception:
+                raw = None
+            if not isinstance(raw, dict):
+                raise APIError("Formato inatteso della risposta di quotations.")
+            yield from QuotationResponse.from_api_payload(raw).data.quotation
+            self._raise_quotation_error(raw)
+            return
+
+        resp = self._request("POST", self._url_quotations, headers=headers, json_body=payload, stream=True)
+
+        with resp:
+            # resp.raw non decomprime da solo (gzip/deflate)
+            resp.raw.decode_content = True
+            rest = ObjectBuilder()  # tutto il documento tranne gli elementi di data.quotation
+            item: Optional[ObjectBuilder] = None
+            streamed = False
+            try:
+                for prefix, event, value in ijson.parse(resp.raw, use_float=True):
+                    if item is not None:
+                        item.event(event, value)
+                        if event == "end_map" and prefix == "data.quotation.item":
+                            streamed = True
+                            yield QuotationItem.from_api_dict(item.value)
+                            item = None
+                        continue
+                    if event == "start_map" and prefix == "data.quotation.item":
+                        item = ObjectBuilder()
+                        item.event(event, value)
+                        continue
+                    rest.event(event, value)
+            except ijson.JSONError as exc:
+                raise APIError(f"Formato inatteso della risposta di quotations: {exc}") from exc
+
+        raw = getattr(rest, "value", None)
+        if not isinstance(raw, dict):
             raise APIError("Formato inatteso della risposta di quotations.")
-        return QuotationResponse.from_api_payload(data)
+        if not streamed:
+            # altre forme della risposta (data come lista, elemento singolo, "Data")
+            yield from QuotationResponse.from_api_payload(raw).data.quotation
+        self._raise_quotation_error(raw)
 
     # -------------------- Payments --------------------
     def payments(self, request: Optional[PaymentsRequest] = None, *, channel: Optional[str] = None) -> PaymentsResponse:
@@ -1274,13 +1758,13 @@ class MyRentClient:
         if channel:
             headers["channel"] = self._require_channel(channel)
 
-        resp = self._request("POST", self.PAYMENTS_PATH, headers=headers, json_body=req.to_payload())
+        resp = self._request("POST", self._url_payments, headers=headers, json_body=req.to_payload())
         payload = self._parse_json(resp)
         return PaymentsResponse.from_api_payload(payload)
 
     # -------------------- Create Booking --------------------
     def create_booking(self, request: BookingRequest) -> BookingResponse:
-        headers = {"tokenValue": self.token_value}
+        headers = self._token_headers()
         payload = request.to_payload()
 
         if "channel" not in payload:
@@ -1288,7 +1772,7 @@ class MyRentClient:
         else:
             payload["channel"] = self._require_channel(payload.get("channel"))
 
-        resp = self._request("POST", self.BOOKINGS_PATH, headers=headers, json_body=payload)
+        resp = self._request("POST", self._url_bookings, headers=headers, json_body=payload)
         data = self._parse_json(resp)
         return BookingResponse.from_api_payload(data)
 
@@ -1298,28 +1782,37 @@ class MyRentClient:
         ch = self._require_channel(channel)
         headers = {"tokenValue": self.token_value, "channel": ch}
 
-        path = f"{self.BOOKINGS_PATH}/{bid}"
-        resp = self._request("GET", path, headers=headers)
+        resp = self._request("GET", self._url_booking_prefix + bid, headers=headers)
         payload = self._parse_json(resp)
         return BookingResponse.from_api_payload(payload)
 
     # -------------------- Get Booking Status --------------------
     def get_booking_status(self, booking_id: str) -> BookingStatus:
         bid = _encode_path_segment(booking_id)
-        headers = {"tokenValue": self.token_value}
-
-        path = f"{self.BOOKINGS_PATH}/{bid}{self.BOOKING_STATUS_SUFFIX}"
-        resp = self._request("GET", path, headers=headers)
+        url = self._url_booking_prefix + bid + self.BOOKING_STATUS_SUFFIX
+        resp = self._request("GET", url, headers=self._token_headers())
         payload = self._parse_json(resp)
         return BookingStatus.from_api_payload(payload)
 
+    def batch_get_booking_status(self, booking_ids: Sequence[str], max_workers: int = 8) -> List[BookingStatus]:
+        # I thread condividono sessione e stato del client: un 401 rinnova il token una
+        # sola volta sotto _auth_lock (vedi _request), mentre le cache interne
+        # (_auth_headers, _channel_memo) sono sostituite con un'unica assegnazione e al
+        # più ricalcolate. max_workers da tenere entro pool_maxsize; risultati nello
+        # stesso ordine degli id.
+        ids = list(booking_ids)
+        if not ids:
+            return []
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(ids))) as executor:
+            return list(executor.map(self.get_booking_status, ids))
+
     # -------------------- Cancel Booking --------------------
     def cancel_booking(self, booking_id: str, channel: Optional[str]) -> CancelResult:
         bid = _encode_path_segment(booking_id)
         ch = self._require_channel(channel)
         headers = {"tokenValue": self.token_value, "channel": ch}
 
-        path = f"{self.BOOKINGS_PATH}/{bid}{self.BOOKING_CANCEL_SUFFIX}"
-        resp = self._request("GET", path, headers=headers)
+        url = self._url_booking_prefix + bid + self.BOOKING_CANCEL_SUFFIX
+        resp = self._request("GET", url, headers=headers)
         payload = self._parse_json(resp)
         return CancelResult.from_api_payload(payload)
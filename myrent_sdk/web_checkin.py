@@ -7,6 +7,14 @@ import logging
 import time
 
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+from .main import _default_logger, _response_json
 
 
 __all__ = [
@@ -114,7 +122,18 @@ def _to_form_body(d: Dict[str, Any]) -> Dict[str, Any]:
     return out
 
 
+# datetime e dataclass passano da default=str come con json, per lo stesso output
+_ORJSON_BODY_OPTIONS = (
+    orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS if orjson is not None else 0
+)
+
+
 def _json_dumps_body(d: Dict[str, Any]) -> str:
+    if orjson is not None:
+        try:
+            return orjson.dumps(d, default=str, option=_ORJSON_BODY_OPTIONS).decode()
+        except TypeError:
+            pass
     return json.dumps(d, ensure_ascii=False, separators=(",", ":"), default=str)
 
 
@@ -710,6 +729,7 @@ class MyRentWebCheckInClient:
         logger: Optional[logging.Logger] = None,
         session: Optional[requests.Session] = None,
         portal_auth_mode: str = "combined_then_token_then_basic",
+        pool_maxsize: int = 20,
     ) -> None:
         self.base_url = _normalize_base_url(base_url)
 
@@ -724,14 +744,23 @@ class MyRentWebCheckInClient:
         self.user_agent = user_agent or "myrent-web-checkin-sdk/4.1"
         self.portal_auth_mode = portal_auth_mode.strip().lower()
 
-        self.log = logger or logging.getLogger("myrent_web_checkin_sdk")
-        if not self.log.handlers:
-            handler = logging.StreamHandler()
-            handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
-            self.log.addHandler(handler)
-            self.log.setLevel(logging.INFO)
-
-        self.session = session or requests.Session()
+        self.log = logger or _default_logger("myrent_web_checkin_sdk")
+
+        self._owns_session = session is None
+        if session is None:
+            # connessioni keep-alive riusate fra auth, ricerca reservation e update;
+            # i retry restano gestiti da _request
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize, pool_block=False)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            # header comuni impostati una volta sulla sessione propria; _headers() aggiunge
+            # solo quelli variabili. Una sessione del chiamante non si modifica.
+            session.headers.update({
+                "User-Agent": self.user_agent,
+                "Accept": "application/json",
+            })
+        self.session = session
 
     # -------------------------------------------------------------------------
     # Low level HTTP
@@ -749,11 +778,15 @@ class MyRentWebCheckInClient:
         content_type: Optional[str] = None,
         accept: Optional[str] = "application/json",
     ) -> Dict[str, str]:
-        h: Dict[str, str] = {
-            "User-Agent": self.user_agent,
-        }
-        if accept:
-            h["Accept"] = accept
+        h: Dict[str, str] = {}
+        if not self._owns_session:
+            # sessione del chiamante: header comuni uniti a ogni richiesta
+            h["User-Agent"] = self.user_agent
+            if accept:
+                h["Accept"] = accept
+        elif accept != "application/json":
+            # senza accept esplicito vale il default di requests, come prima
+            h["Accept"] = accept or "*/*"
         if content_type:
             h["Content-Type"] = content_type
         if extra:
@@ -863,21 +896,19 @@ class MyRentWebCheckInClient:
 
     @staticmethod
     def _parse_json(resp: requests.Response) -> Any:
-        ct = (resp.headers.get("Content-Type") or "").lower()
-        if "application/json" in ct or "json" in ct:
-            return resp.json()
+        # il body si prova sempre come JSON, a prescindere dal Content-Type dichiarato
         try:
-            return resp.json()
-        except Exception:
+            return _response_json(resp)
+        except ValueError:
             return resp.text
 
     @staticmethod
     def _payload_preview(resp: requests.Response) -> str:
         try:
-            payload = resp.json()
+            payload = _response_json(resp)
         except Exception:
             payload = {"raw": resp.text}
-        return json.dumps(payload, ensure_ascii=False, default=str)[:1000]
+        return _json_dumps_body(payload)[:1000]
 
     def _raise_http_error(self, *, method: str, path: str, resp: requests.Response) -> None:
         url = self.base_url + path
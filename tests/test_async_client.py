@@ -0,0 +1,89 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from myrent_sdk.async_client import AsyncMyRentClient
+from myrent_sdk.main import APIError
+
+
+class _StubClient:
+    """Client sincrono finto: registra il massimo di chiamate contemporanee."""
+
+    def __init__(self, delay: float = 0.02, fail_on=()):
+        self.delay = delay
+        self.fail_on = set(fail_on)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def _enter(self):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def _exit(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def get_booking_status(self, booking_id):
+        self._enter()
+        try:
+            # tempi decrescenti: le ultime richieste finiscono per prime
+            time.sleep(self.delay / (1 + int(booking_id)))
+            if booking_id in self.fail_on:
+                raise APIError(f"booking {booking_id} non trovato")
+            return f"status-{booking_id}"
+        finally:
+            self._exit()
+
+    def get_booking(self, booking_id, channel):
+        return self.get_booking_status(booking_id) + f"@{channel}"
+
+    def get_quotations(self, request):
+        return self.get_booking_status(request)
+
+    def payments(self, request=None, *, channel=None):
+        return (request, channel)
+
+
+class AsyncMyRentClientTest(unittest.TestCase):
+    def test_results_keep_request_order(self):
+        client = AsyncMyRentClient(_StubClient(), max_concurrency=4)
+        ids = [str(i) for i in range(10)]
+        self.assertEqual(
+            asyncio.run(client.get_many_booking_status(ids)),
+            [f"status-{i}" for i in ids],
+        )
+        self.assertEqual(
+            asyncio.run(client.get_many_bookings(ids[:3], "WEB")),
+            ["status-0@WEB", "status-1@WEB", "status-2@WEB"],
+        )
+        self.assertEqual(asyncio.run(client.get_many_quotations(["2", "1"])), ["status-2", "status-1"])
+
+    def test_concurrency_is_bounded_by_semaphore(self):
+        stub = _StubClient(delay=0.05)
+        client = AsyncMyRentClient(stub, max_concurrency=3)
+        asyncio.run(client.get_many_booking_status([str(i) for i in range(12)]))
+        self.assertEqual(stub.max_in_flight, 3)
+
+    def test_client_reusable_across_event_loops(self):
+        stub = _StubClient()
+        client = AsyncMyRentClient(stub, max_concurrency=2)
+        ids = [str(i) for i in range(6)]
+        for _ in range(2):
+            self.assertEqual(asyncio.run(client.get_many_booking_status(ids)), [f"status-{i}" for i in ids])
+        self.assertEqual(stub.max_in_flight, 2)
+
+    def test_errors_propagate(self):
+        client = AsyncMyRentClient(_StubClient(fail_on={"3"}), max_concurrency=4)
+        with self.assertRaisesRegex(APIError, "booking 3"):
+            asyncio.run(client.get_many_booking_status([str(i) for i in range(6)]))
+
+    def test_payments_forwards_channel(self):
+        client = AsyncMyRentClient(_StubClient())
+        self.assertEqual(asyncio.run(client.payments(channel="WEB")), (None, "WEB"))
+
+
+if __name__ == "__main__":
+    unittest.main()
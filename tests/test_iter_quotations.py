@@ -0,0 +1,139 @@
+import gzip
+import io
+import json
+import unittest
+from contextlib import ExitStack
+from unittest import mock
+
+import requests
+import urllib3
+
+from myrent_sdk import main
+from myrent_sdk.main import APIError, MyRentClient, QuotationRequest
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover
+    ijson = None
+
+
+def _response(body: bytes, *, gzipped: bool = False) -> requests.Response:
+    # risposta con body ancora da leggere, come con stream=True
+    headers = {"Content-Type": "application/json"}
+    if gzipped:
+        body = gzip.compress(body)
+        headers["Content-Encoding"] = "gzip"
+    resp = requests.Response()
+    resp.status_code = 200
+    resp.headers.update(headers)
+    resp.raw = urllib3.HTTPResponse(
+        body=io.BytesIO(body), headers=headers, preload_content=False, decode_content=False
+    )
+    return resp
+
+
+_OK_PAYLOAD = {
+    "status": "ok",
+    "data": {
+        "quotation": [
+            {"total": 120, "Vehicles": [{"code": "A", "price": 10.5, "tags": ["x"]}]},
+            {"total": 80, "optionals": [{"code": "GPS", "included": False}]},
+        ],
+        "TotalCharge": {"amount": 200},
+    },
+}
+
+_ERROR_AFTER_ITEMS = {
+    "data": {
+        "quotation": [{"total": 1}],
+        "errors": {"Error": {"Code": "366", "ShortText": "channel"}},
+    },
+}
+
+
+class _IterQuotationsBase(unittest.TestCase):
+    streaming = True
+
+    def setUp(self):
+        self.client = MyRentClient("http://example.invalid", token_value="tok", company_code="WEB")
+        self.request = QuotationRequest(
+            drop_off_location="FCO",
+            end_date="2026-01-02T10:00:00",
+            pickup_location="FCO",
+            start_date="2026-01-01T10:00:00",
+            age=30,
+        )
+
+    def _patched(self, body: bytes, **response_kwargs) -> ExitStack:
+        stack = ExitStack()
+        self.request_mock = stack.enter_context(
+            mock.patch.object(self.client, "_request", return_value=_response(body, **response_kwargs))
+        )
+        if not self.streaming:
+            stack.enter_context(mock.patch.object(main, "ijson", None))
+        return stack
+
+    def _items(self, payload, **response_kwargs):
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        with self._patched(body, **response_kwargs):
+            return list(self.client.iter_quotations(self.request))
+
+
+@unittest.skipUnless(ijson, "ijson non installato (requirements-test.txt)")
+class IterQuotationsStreamingTest(_IterQuotationsBase):
+    streaming = True
+
+    def test_streams_quotation_items(self):
+        items = self._items(_OK_PAYLOAD)
+        self.assertTrue(self.request_mock.call_args.kwargs["stream"])
+        self.assertEqual([i.total for i in items], [120, 80])
+        self.assertEqual(items[0].vehicles, [{"code": "A", "price": 10.5, "tags": ["x"]}])
+        self.assertIs(type(items[0].vehicles[0]["price"]), float)
+        self.assertEqual(items[1].optionals, [{"code": "GPS", "included": False}])
+
+    def test_gzip_body_is_decoded(self):
+        items = self._items(_OK_PAYLOAD, gzipped=True)
+        self.assertEqual([i.total for i in items], [120, 80])
+
+    def test_other_shapes_are_not_lost(self):
+        self.assertEqual([i.total for i in self._items({"data": [{"total": 3}]})], [3])
+        self.assertEqual([i.total for i in self._items({"Data": {"Vehicles": [], "total": 4}})], [4])
+
+    def test_error_raised_after_items(self):
+        seen = []
+        with self._patched(json.dumps(_ERROR_AFTER_ITEMS).encode()):
+            with self.assertRaisesRegex(APIError, "code=366"):
+                for it in self.client.iter_quotations(self.request):
+                    seen.append(it.total)
+        self.assertEqual(seen, [1])
+
+    def test_invalid_json_is_api_error(self):
+        for body in (b"not json", b"[1]"):
+            with self.subTest(body=body):
+                with self.assertRaisesRegex(APIError, "Formato inatteso"):
+                    self._items(body)
+
+
+class IterQuotationsWithoutIjsonTest(_IterQuotationsBase):
+    streaming = False
+
+    def test_yields_items_without_streaming(self):
+        items = self._items(_OK_PAYLOAD)
+        self.assertNotIn("stream", self.request_mock.call_args.kwargs)
+        self.assertEqual([i.total for i in items], [120, 80])
+
+    def test_error_raised_after_items(self):
+        seen = []
+        with self._patched(json.dumps(_ERROR_AFTER_ITEMS).encode()):
+            with self.assertRaisesRegex(APIError, "code=366"):
+                for it in self.client.iter_quotations(self.request):
+                    seen.append(it.total)
+        self.assertEqual(seen, [1])
+
+    def test_invalid_json_is_api_error(self):
+        with self.assertRaisesRegex(APIError, "Formato inatteso"):
+            self._items(b"not json")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import sys
+import unittest
+from unittest import mock
+
+from myrent_sdk.main import QuotationRequest
+
+
+def _request(**kwargs) -> QuotationRequest:
+    return QuotationRequest(
+        drop_off_location="FCO",
+        end_date="2026-01-02T10:00:00",
+        pickup_location="FCO",
+        start_date="2026-01-01T10:00:00",
+        age=22,
+        **kwargs,
+    )
+
+
+class LegacyYoungDriverKeyTest(unittest.TestCase):
+    def test_default_emits_both_keys(self):
+        payload = _request(is_young_driver_age=True).to_payload()
+        self.assertIs(payload["isYoungDriverAge"], True)
+        self.assertIs(payload["isyoungDriverAge"], True)
+
+    def test_class_flag_false_emits_only_canonical_key(self):
+        with mock.patch.object(QuotationRequest, "EMIT_LEGACY_YOUNG_DRIVER_KEY", False):
+            payload = _request(is_young_driver_age=False).to_payload()
+        self.assertIs(payload["isYoungDriverAge"], False)
+        self.assertNotIn("isyoungDriverAge", payload)
+
+    def test_subclass_can_disable_legacy_key(self):
+        class CanonicalOnly(QuotationRequest):
+            EMIT_LEGACY_YOUNG_DRIVER_KEY = False
+
+        payload = CanonicalOnly(
+            drop_off_location="FCO",
+            end_date="2026-01-02T10:00:00",
+            pickup_location="FCO",
+            start_date="2026-01-01T10:00:00",
+            age=22,
+            is_young_driver_age=True,
+        ).to_payload()
+        self.assertIs(payload["isYoungDriverAge"], True)
+        self.assertNotIn("isyoungDriverAge", payload)
+        # la classe base non cambia
+        self.assertIn("isyoungDriverAge", _request(is_young_driver_age=True).to_payload())
+
+    def test_no_young_driver_keys_when_unset(self):
+        payload = _request().to_payload()
+        self.assertNotIn("isYoungDriverAge", payload)
+        self.assertNotIn("isyoungDriverAge", payload)
+
+    @unittest.skipUnless(sys.version_info >= (3, 10), "slots sui dataclass da Python 3.10")
+    def test_instance_assignment_is_rejected(self):
+        req = _request(is_young_driver_age=True)
+        with self.assertRaises(AttributeError):
+            req.EMIT_LEGACY_YOUNG_DRIVER_KEY = False